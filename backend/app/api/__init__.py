@@ -1,4 +1,4 @@
 # API Router'ları
-from app.api import search, businesses, exports, auth
+from app.api import search, businesses, exports, selections, auth
 
-__all__ = ["search", "businesses", "exports", "auth"]
+__all__ = ["search", "businesses", "exports", "selections", "auth"]
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import timedelta
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db, run_write
 from app.core.config import ACCESS_TOKEN_EXPIRE_MINUTES
 from app.core.security import (
     hash_password, 
@@ -65,7 +65,7 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-def login(user_data: UserLogin, db: Session = Depends(get_db)):
+def login(user_data: UserLogin, db: Session = Depends(get_read_db)):
     """Kullanıcı girişi"""
     user = db.query(User).filter(User.email == user_data.email).first()
     
@@ -93,30 +93,39 @@ def get_me(current_user: User = Depends(get_current_user)):
     return current_user
 
 
+def _update_user(db: Session, user_id: int, values: dict) -> User:
+    """Kullanıcı kolonlarını güncelle (yazıcı kuyruğunda)"""
+    user = db.get(User, user_id)
+    for key, value in values.items():
+        setattr(user, key, value)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
 @router.put("/me", response_model=UserResponse)
-def update_me(
+async def update_me(
     user_data: UserUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user)
 ):
     """Kullanıcı bilgilerini güncelle"""
+    values = {}
     if user_data.full_name:
-        current_user.full_name = user_data.full_name
+        values["full_name"] = user_data.full_name
     if user_data.company_name is not None:
-        current_user.company_name = user_data.company_name
+        values["company_name"] = user_data.company_name
     if user_data.phone is not None:
-        current_user.phone = user_data.phone
+        values["phone"] = user_data.phone
     
-    db.commit()
-    db.refresh(current_user)
-    return current_user
+    if not values:
+        return current_user
+    return await run_write(_update_user, current_user.id, values)
 
 
 @router.post("/change-password")
-def change_password(
+async def change_password(
     password_data: PasswordChange,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user)
 ):
     """Şifre değiştir"""
     if not verify_password(password_data.current_password, current_user.hashed_password):
@@ -125,7 +134,8 @@ def change_password(
             detail="Mevcut şifre yanlış"
         )
     
-    current_user.hashed_password = hash_password(password_data.new_password)
-    db.commit()
+    await run_write(_update_user, current_user.id, {
+        "hashed_password": hash_password(password_data.new_password)
+    })
     
     return {"message": "Şifre başarıyla değiştirildi"}
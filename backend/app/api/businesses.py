@@ -4,13 +4,19 @@
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import Optional, List
+from sqlalchemy import or_, and_
+from typing import Optional, List, Tuple
+from datetime import datetime
+import base64
+import json
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.security import get_current_user_optional
 from app.models.business import Business
+from app.models.stats import BusinessStats, CityStats, CategoryStats
 from app.models.user import User
+from app.services.business_filters import compile_filters
+from app.services.filter_results import filter_results, LIST_ORDER
 from app.schemas.business import (
     BusinessResponse, 
     BusinessUpdate, 
@@ -25,97 +31,156 @@ router = APIRouter()
 def get_businesses(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor sayfalama (ilk sayfa için boş bırakılarak gönderilir)"),
+    with_total: Optional[bool] = Query(None, description="Toplam sayıyı da döndür (cursor modunda varsayılan kapalı)"),
     city: Optional[str] = None,
     business_type: Optional[str] = None,
     has_phone: Optional[bool] = None,
     has_website: Optional[bool] = None,
     min_rating: Optional[float] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
+    bbox: Optional[str] = Query(None, description="Harita görünümü: batı,güney,doğu,kuzey (Leaflet toBBoxString)"),
+    near: Optional[str] = Query(None, description="Merkez noktası: enlem,boylam"),
+    radius: float = Query(1000, gt=0, le=100000, description="near için yarıçap (metre)"),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user_optional)
 ):
-    """İşletme listesini getir (filtreli)"""
-    query = db.query(Business)
-    
+    """İşletme listesini getir (filtreli)
+
+    Sayfa numarasıyla sayfalamada filtrenin bu veri sürümündeki ID dizisi önbellekteyse
+    (ID toplama / dışa aktarım) ondan dilimlenir, yoksa LIMIT/OFFSET kullanılır; sayfa için
+    dizi oluşturulmaz. Toplam sayı filtre ve veri sürümü başına önbelleklenir. `cursor` verilirse
+    (created_at, id) üzerinden keyset sayfalama yapılır; her sayfa sabit maliyetlidir.
+    """
     # Filtreler
-    if city:
-        query = query.filter(Business.city.ilike(f"%{city}%"))
-    if business_type:
-        query = query.filter(Business.business_type.ilike(f"%{business_type}%"))
-    if has_phone:
-        query = query.filter(Business.phone.isnot(None), Business.phone != "")
-    if has_website:
-        query = query.filter(Business.website.isnot(None), Business.website != "")
-    if min_rating:
-        query = query.filter(Business.rating >= min_rating)
-    if search:
-        query = query.filter(
-            (Business.name.ilike(f"%{search}%")) |
-            (Business.address.ilike(f"%{search}%"))
-        )
+    compiled = compile_filters(
+        city=city,
+        business_type=business_type,
+        has_phone=has_phone,
+        has_website=has_website,
+        min_rating=min_rating,
+        search=search,
+        bbox=_parse_bbox(bbox),
+        near=_parse_point(near),
+        radius=radius if near else None
+    )
     
-    # Toplam sayı
-    total = query.count()
+    cursor_mode = cursor is not None
+    if with_total is None:
+        with_total = not cursor_mode
     
-    # Sayfalama
-    total_pages = (total + per_page - 1) // per_page
-    offset = (page - 1) * per_page
+    # Toplam sayı (veri sürümü başına bir kez sayılır)
+    total = total_pages = None
+    if with_total:
+        total = filter_results.count(db, compiled)
+        total_pages = (total + per_page - 1) // per_page
     
-    businesses = query.order_by(Business.created_at.desc()).offset(offset).limit(per_page).all()
+    next_cursor = None
+    query = compiled.apply(db.query(Business)).order_by(*LIST_ORDER)
+    
+    if cursor_mode:
+        # Keyset sayfalama: son görülen (created_at, id) sonrasından devam
+        if cursor:
+            created_at, last_id = _decode_cursor(cursor)
+            query = query.filter(or_(
+                Business.created_at < created_at,
+                and_(Business.created_at == created_at, Business.id < last_id)
+            ))
+        businesses = query.limit(per_page + 1).all()
+        if len(businesses) > per_page:
+            businesses = businesses[:per_page]
+            next_cursor = _encode_cursor(businesses[-1])
+    else:
+        offset = (page - 1) * per_page
+        cached = filter_results.peek(db, compiled)
+        if cached is not None:
+            # ID toplama / dışa aktarım aynı filtreyi bu sürümde değerlendirdi: dilimle, PK ile oku
+            page_ids = cached[offset:offset + per_page].tolist()
+            rows = {b.id: b for b in db.query(Business).filter(Business.id.in_(page_ids))}
+            businesses = [rows[business_id] for business_id in page_ids if business_id in rows]
+        else:
+            businesses = query.offset(offset).limit(per_page).all()
     
     return BusinessListResponse(
         businesses=[BusinessResponse.model_validate(b) for b in businesses],
         total=total,
         page=page,
         per_page=per_page,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor
     )
 
 
+def _parse_floats(value: str, count: int, name: str) -> List[float]:
+    """Virgülle ayrılmış sayı listesini ayrıştır"""
+    try:
+        numbers = [float(x) for x in value.split(",")]
+    except ValueError:
+        numbers = []
+    if len(numbers) != count:
+        raise HTTPException(status_code=400, detail=f"Geçersiz {name} parametresi")
+    return numbers
+
+
+def _parse_bbox(bbox: Optional[str]) -> Optional[Tuple[float, float, float, float]]:
+    """"batı,güney,doğu,kuzey" -> (güney, batı, kuzey, doğu)"""
+    if not bbox:
+        return None
+    west, south, east, north = _parse_floats(bbox, 4, "bbox")
+    return south, west, north, east
+
+
+def _parse_point(point: Optional[str]) -> Optional[Tuple[float, float]]:
+    """"enlem,boylam" -> (enlem, boylam)"""
+    if not point:
+        return None
+    lat, lon = _parse_floats(point, 2, "near")
+    return lat, lon
+
+
+def _encode_cursor(business: Business) -> str:
+    """Son kaydın (created_at, id) çiftini opak cursor'a çevir"""
+    raw = json.dumps([business.created_at.isoformat(), business.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Opak cursor'ı (created_at, id) çiftine çevir"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, last_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(last_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Geçersiz cursor")
+
+
 @router.get("/stats", response_model=StatsResponse)
-def get_stats(db: Session = Depends(get_db)):
-    """İstatistikleri getir"""
-    total = db.query(Business).count()
-    
-    with_phone = db.query(Business).filter(
-        Business.phone.isnot(None),
-        Business.phone != ""
-    ).count()
+def get_stats(db: Session = Depends(get_read_db)):
+    """İstatistikleri getir (tetikleyicilerle güncellenen sayaçlardan)"""
+    stats = db.query(BusinessStats).filter(BusinessStats.id == 1).first()
     
-    with_website = db.query(Business).filter(
-        Business.website.isnot(None),
-        Business.website != ""
-    ).count()
-    
-    avg_rating = db.query(func.avg(Business.rating)).filter(
-        Business.rating.isnot(None)
-    ).scalar()
+    avg_rating = None
+    if stats and stats.rating_count:
+        avg_rating = stats.rating_sum / stats.rating_count
     
     # Şehre göre dağılım
-    city_stats = db.query(
-        Business.city,
-        func.count(Business.id)
-    ).filter(
-        Business.city.isnot(None),
-        Business.city != ""
-    ).group_by(Business.city).order_by(func.count(Business.id).desc()).limit(10).all()
+    city_stats = db.query(CityStats.city, CityStats.count).filter(
+        CityStats.count > 0
+    ).order_by(CityStats.count.desc()).limit(10).all()
     
     by_city = {city: count for city, count in city_stats if city}
     
     # Kategoriye göre dağılım
-    category_stats = db.query(
-        Business.business_type,
-        func.count(Business.id)
-    ).filter(
-        Business.business_type.isnot(None)
-    ).group_by(Business.business_type).order_by(func.count(Business.id).desc()).limit(10).all()
+    category_stats = db.query(CategoryStats.business_type, CategoryStats.count).filter(
+        CategoryStats.count > 0
+    ).order_by(CategoryStats.count.desc()).limit(10).all()
     
     by_category = {cat: count for cat, count in category_stats if cat}
     
     return StatsResponse(
-        total_businesses=total,
-        with_phone=with_phone,
-        with_website=with_website,
+        total_businesses=stats.total if stats else 0,
+        with_phone=stats.with_phone if stats else 0,
+        with_website=stats.with_website if stats else 0,
         avg_rating=round(avg_rating, 2) if avg_rating else None,
         by_city=by_city,
         by_category=by_category,
@@ -131,33 +196,23 @@ def get_all_filtered_ids(
     has_website: Optional[bool] = None,
     min_rating: Optional[float] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """Filtrelenmiş tüm işletme ID'lerini getir (export için)"""
-    query = db.query(Business.id)
-    
-    if city:
-        query = query.filter(Business.city.ilike(f"%{city}%"))
-    if business_type:
-        query = query.filter(Business.business_type.ilike(f"%{business_type}%"))
-    if has_phone:
-        query = query.filter(Business.phone.isnot(None), Business.phone != "")
-    if has_website:
-        query = query.filter(Business.website.isnot(None), Business.website != "")
-    if min_rating:
-        query = query.filter(Business.rating >= min_rating)
-    if search:
-        query = query.filter(
-            (Business.name.ilike(f"%{search}%")) |
-            (Business.address.ilike(f"%{search}%"))
-        )
-    
-    ids = [row[0] for row in query.all()]
-    return {"ids": ids, "total": len(ids)}
+    """Filtrelenmiş tüm işletme ID'lerini getir (export için, liste sırasıyla)"""
+    compiled = compile_filters(
+        city=city,
+        business_type=business_type,
+        has_phone=has_phone,
+        has_website=has_website,
+        min_rating=min_rating,
+        search=search
+    )
+    ids = filter_results.ids(db, compiled)
+    return {"ids": ids.tolist(), "total": len(ids)}
 
 
 @router.get("/{business_id}", response_model=BusinessResponse)
-def get_business(business_id: int, db: Session = Depends(get_db)):
+def get_business(business_id: int, db: Session = Depends(get_read_db)):
     """Tek bir işletme detayı"""
     business = db.query(Business).filter(Business.id == business_id).first()
     if not business:
@@ -3,19 +3,56 @@ Dışa Aktarım API Endpoint'leri
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import Optional, List
-import io
-import json
+import os
+import tempfile
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.models.business import Business
+from app.schemas.business import ExportRequest, ExportJobResponse
+from app.services.business_export import (
+    EXPORT_COLUMNS, EXPORT_FORMATS, csv_chunks, json_chunks, ndjson_chunks
+)
+from app.services.business_filters import FILTER_KEYS, compile_filters, id_set_filter
+from app.services.export_jobs import export_jobs, ExportJob
+from app.services.filter_results import filter_results
+from app.services.selections import selection_service
 
 router = APIRouter()
 
 
+def _export_query(
+    db: Session,
+    id_list: Optional[List[int]],
+    filters: dict,
+    selection: Optional[str] = None
+):
+    """Seçim token'ı, ID listesi ya da filtrelerden dışa aktarım sorgusu oluştur"""
+    query = db.query(Business)
+    
+    # Sunucu tarafı seçim (büyük ID listeleri URL'de taşınmaz)
+    if selection:
+        stored = selection_service.get(db, selection)
+        if not stored:
+            raise HTTPException(status_code=404, detail="Seçim bulunamadı veya süresi doldu")
+        query = selection_service.apply(query, stored)
+    # ID bazlı filtreleme
+    elif id_list:
+        query = query.filter(Business.id.in_(id_list))
+    else:
+        # Diğer filtreler: sürüm etiketli ID dizisi üzerinden (liste sayfaları, ID toplama ve
+        # sonraki dışa aktarımlar aynı değerlendirmeyi kullanır)
+        compiled = compile_filters(**{key: filters.get(key) for key in FILTER_KEYS})
+        if not compiled.is_empty:
+            query = query.filter(id_set_filter(filter_results.ids(db, compiled)))
+    return query
+
+
 @router.get("/download/{format}")
 def download_export(
     format: str,
@@ -26,168 +63,128 @@ def download_export(
     has_website: Optional[bool] = None,
     min_rating: Optional[float] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db)
+    selection: Optional[str] = Query(None, description="Seçim token'ı (/api/selections)"),
+    db: Session = Depends(get_read_db)
 ):
     """Filtrelenmiş işletmeleri dışa aktar"""
     
-    if format not in ["xlsx", "csv", "json"]:
-        raise HTTPException(status_code=400, detail="Geçersiz format. xlsx, csv veya json kullanın.")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail="Geçersiz format. xlsx, csv, json, ndjson, parquet veya arrow kullanın."
+        )
     
-    # Query oluştur
-    query = db.query(Business)
-    
-    # ID bazlı filtreleme
+    id_list = None
     if ids:
         id_list = [int(x.strip()) for x in ids.split(",") if x.strip().isdigit()]
-        if id_list:
-            query = query.filter(Business.id.in_(id_list))
-    else:
-        # Diğer filtreler
-        if city:
-            query = query.filter(Business.city.ilike(f"%{city}%"))
-        if business_type:
-            query = query.filter(Business.business_type.ilike(f"%{business_type}%"))
-        if has_phone:
-            query = query.filter(Business.phone.isnot(None), Business.phone != "")
-        if has_website:
-            query = query.filter(Business.website.isnot(None), Business.website != "")
-        if min_rating:
-            query = query.filter(Business.rating >= min_rating)
-        if search:
-            query = query.filter(
-                (Business.name.ilike(f"%{search}%")) |
-                (Business.address.ilike(f"%{search}%"))
-            )
-    
-    businesses = query.all()
-    
-    if not businesses:
+    query = _export_query(db, id_list, {
+        "city": city,
+        "business_type": business_type,
+        "has_phone": has_phone,
+        "has_website": has_website,
+        "min_rating": min_rating,
+        "search": search
+    }, selection)
+    
+    # Akış başladıktan sonra hata kodu dönülemez; boş sonuç önceden kontrol edilir
+    if query.with_entities(Business.id).first() is None:
         raise HTTPException(status_code=404, detail="İşletme bulunamadı")
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
-    if format == "xlsx":
-        return _generate_xlsx(businesses, timestamp)
-    elif format == "csv":
-        return _generate_csv(businesses, timestamp)
-    else:
-        return _generate_json(businesses, timestamp)
+    statement = query.with_entities(*EXPORT_COLUMNS).statement
+    if format == "csv":
+        return _generate_csv(statement, timestamp)
+    if format == "json":
+        return _generate_json(statement, timestamp)
+    if format == "ndjson":
+        return _generate_ndjson(statement, timestamp)
+    
+    # xlsx, parquet, arrow: önce geçici dosyaya yazılır
+    return _generate_file(statement, timestamp, format)
 
 
-def _generate_xlsx(businesses: List[Business], timestamp: str):
-    """Excel dosyası oluştur"""
-    try:
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-    except ImportError:
-        raise HTTPException(status_code=500, detail="openpyxl kütüphanesi yüklü değil")
-    
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "İşletmeler"
+@router.post("/jobs", response_model=ExportJobResponse, status_code=202)
+def create_export_job(
+    request: ExportRequest,
+    db: Session = Depends(get_read_db)
+):
+    """Arka planda dışa aktarım işi başlat"""
+    filters = request.filters.model_dump() if request.filters else {}
+    query = _export_query(db, request.business_ids, filters, request.selection)
+    total_rows = query.with_entities(func.count(Business.id)).scalar()
+    if not total_rows:
+        raise HTTPException(status_code=404, detail="İşletme bulunamadı")
     
-    # Başlık stilleri
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_alignment = Alignment(horizontal="center", vertical="center")
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
+    job = export_jobs.submit(
+        request.format, query.with_entities(*EXPORT_COLUMNS).statement, total_rows
     )
-    
-    # Başlıklar
-    headers = [
-        "ID", "İşletme Adı", "Adres", "Şehir", "İlçe", 
-        "Telefon", "Website", "Kategori", "Puan", 
-        "Değerlendirme", "Notlar", "Etiketler"
-    ]
-    
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-        cell.border = thin_border
-    
-    # Veriler
-    for row, business in enumerate(businesses, 2):
-        data = [
-            business.id,
-            business.name,
-            business.address or "",
-            business.city or "",
-            business.district or "",
-            business.phone or "",
-            business.website or "",
-            business.business_type or "",
-            business.rating or "",
-            business.total_ratings or 0,
-            business.notes or "",
-            business.tags or ""
-        ]
-        
-        for col, value in enumerate(data, 1):
-            cell = ws.cell(row=row, column=col, value=value)
-            cell.border = thin_border
-            cell.alignment = Alignment(vertical="center")
-    
-    # Sütun genişlikleri
-    column_widths = [8, 35, 45, 15, 15, 18, 35, 15, 8, 12, 30, 25]
-    for col, width in enumerate(column_widths, 1):
-        ws.column_dimensions[ws.cell(row=1, column=col).column_letter].width = width
-    
-    # Dosyayı oluştur
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
-    
-    return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": f"attachment; filename=isletmeler_{timestamp}.xlsx"
-        }
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}", response_model=ExportJobResponse)
+def get_export_job(job_id: str):
+    """Dışa aktarım işinin durumu (işlenen satır, tahmini kalan süre)"""
+    job = export_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="İş bulunamadı veya süresi doldu")
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}/download")
+def download_export_job(job_id: str):
+    """Tamamlanan işin dosyasını indir (Range destekli, kaldığı yerden devam edilebilir)"""
+    job = export_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="İş bulunamadı veya süresi doldu")
+    if job.status == "failed":
+        raise HTTPException(status_code=409, detail=f"İş başarısız oldu: {job.error}")
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail="İş henüz tamamlanmadı")
+    
+    extension, media_type, _, _ = EXPORT_FORMATS[job.format]
+    timestamp = job.created_at.strftime("%Y%m%d_%H%M%S")
+    return FileResponse(
+        job.path,
+        media_type=media_type,
+        filename=f"isletmeler_{timestamp}.{extension}"
     )
 
 
-def _generate_csv(businesses: List[Business], timestamp: str):
-    """CSV dosyası oluştur"""
-    import csv
-    
-    output = io.StringIO()
-    writer = csv.writer(output, quoting=csv.QUOTE_ALL)
-    
-    # Başlıklar
-    writer.writerow([
-        "ID", "İşletme Adı", "Adres", "Şehir", "İlçe",
-        "Telefon", "Website", "Kategori", "Puan",
-        "Değerlendirme", "Notlar", "Etiketler"
-    ])
-    
-    # Veriler
-    for business in businesses:
-        writer.writerow([
-            business.id,
-            business.name,
-            business.address or "",
-            business.city or "",
-            business.district or "",
-            business.phone or "",
-            business.website or "",
-            business.business_type or "",
-            business.rating or "",
-            business.total_ratings or 0,
-            business.notes or "",
-            business.tags or ""
-        ])
-    
-    output.seek(0)
-    content = output.getvalue().encode('utf-8-sig')
-    
+def _job_response(job: ExportJob) -> ExportJobResponse:
+    """İş durumunu yanıt şemasına çevir"""
+    data = job.to_dict()
+    if job.status == "done":
+        data["download_url"] = f"/api/exports/jobs/{job.id}/download"
+    return ExportJobResponse(**data)
+
+
+def _generate_file(statement, timestamp: str, format: str):
+    """Dosyayı geçici dosyaya yaz, dosyadan akış olarak gönder (gönderim sonrası silinir)"""
+    extension, media_type, writer, library = EXPORT_FORMATS[format]
+    fd, path = tempfile.mkstemp(prefix="export_", suffix=f".{extension}")
+    os.close(fd)
+    try:
+        writer(statement, path)
+    except ImportError:
+        os.remove(path)
+        raise HTTPException(status_code=500, detail=f"{library} kütüphanesi yüklü değil")
+    except BaseException:
+        os.remove(path)
+        raise
+    
+    return FileResponse(
+        path,
+        media_type=media_type,
+        filename=f"isletmeler_{timestamp}.{extension}",
+        background=BackgroundTask(os.remove, path)
+    )
+
+
+def _generate_csv(statement, timestamp: str):
+    """CSV dosyasını satırlar okundukça akış olarak gönder"""
     return StreamingResponse(
-        io.BytesIO(content),
+        csv_chunks(statement),
         media_type="text/csv; charset=utf-8",
         headers={
             "Content-Disposition": f"attachment; filename=isletmeler_{timestamp}.csv"
@@ -195,17 +192,23 @@ def _generate_csv(businesses: List[Business], timestamp: str):
     )
 
 
-def _generate_json(businesses: List[Business], timestamp: str):
-    """JSON dosyası oluştur"""
-    
-    data = [business.to_dict() for business in businesses]
-    
-    content = json.dumps(data, ensure_ascii=False, indent=2)
-    
+def _generate_json(statement, timestamp: str):
+    """JSON dizisini satırlar okundukça akış olarak gönder"""
     return StreamingResponse(
-        io.BytesIO(content.encode('utf-8')),
+        json_chunks(statement),
         media_type="application/json; charset=utf-8",
         headers={
             "Content-Disposition": f"attachment; filename=isletmeler_{timestamp}.json"
         }
     )
+
+
+def _generate_ndjson(statement, timestamp: str):
+    """Satır başına bir JSON kaydı (NDJSON) akış olarak gönder"""
+    return StreamingResponse(
+        ndjson_chunks(statement),
+        media_type="application/x-ndjson",
+        headers={
+            "Content-Disposition": f"attachment; filename=isletmeler_{timestamp}.ndjson"
+        }
+    )
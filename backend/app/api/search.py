@@ -2,16 +2,25 @@
 Arama API Endpoint'leri
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+import json
+import logging
+from typing import AsyncIterator, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+
 from sqlalchemy.orm import Session
-from typing import List
 
-from app.core.database import get_db
+from app.core.database import get_read_db, run_write
 from app.core.security import get_current_user_optional
-from app.models.business import Business
 from app.models.user import User
-from app.schemas.business import SearchRequest, SearchResponse, BusinessResponse
-from app.services.osm_service import osm_service
+from app.schemas.business import SearchRequest, SearchResponse, SearchJobResponse, BusinessResponse
+from app.services.business_store import bulk_ingest
+from app.services.osm_service import GeocodeUnavailable, osm_service
+from app.services.search_jobs import search_jobs
+from app.services.search_pipeline import search_pipeline
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -53,87 +62,175 @@ def get_categories():
 @router.post("/", response_model=SearchResponse)
 async def search_businesses(
     request: SearchRequest,
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_optional)
 ):
     """İşletme ara ve kaydet"""
     
     # Koordinatları al
-    lat, lon = None, None
-    
-    if request.latitude and request.longitude:
-        lat, lon = request.latitude, request.longitude
-    elif request.location:
-        coords = await osm_service.geocode(request.location)
-        if coords:
-            lat, lon = coords
-        else:
-            raise HTTPException(status_code=400, detail="Konum bulunamadı")
-    elif request.polygon and len(request.polygon) >= 3:
-        # Polygon'un merkezini hesapla
-        lats = [p[0] for p in request.polygon]
-        lons = [p[1] for p in request.polygon]
-        lat = sum(lats) / len(lats)
-        lon = sum(lons) / len(lons)
-    else:
-        raise HTTPException(status_code=400, detail="Konum belirtilmeli")
+    try:
+        lat, lon, _ = await search_pipeline.resolve_center(
+            request.location, request.latitude, request.longitude, request.polygon
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except GeocodeUnavailable:
+        raise HTTPException(status_code=503, detail="Konum servisine şu anda ulaşılamıyor")
     
     # İşletmeleri ara
+    search_stats = {}
     found_businesses = await osm_service.search_businesses(
         latitude=lat,
         longitude=lon,
         business_type=request.business_type,
         radius=request.radius,
         max_results=request.max_results,
-        polygon=request.polygon
+        polygon=request.polygon,
+        stats=search_stats,
+        tiled=request.tiled,
+        max_age_hours=request.max_age_hours
     )
     
-    # Veritabanına kaydet (mükerrer kontrolü ile)
-    new_count = 0
-    duplicate_count = 0
-    saved_businesses = []
-    
-    for business_data in found_businesses:
-        # Mükerrer kontrolü
-        existing = db.query(Business).filter(
-            Business.place_id == business_data["place_id"]
-        ).first()
-        
-        if existing:
-            duplicate_count += 1
-            saved_businesses.append(existing)
-        else:
-            # Yeni kayıt
-            new_business = Business(
-                place_id=business_data["place_id"],
-                name=business_data["name"],
-                address=business_data.get("address"),
-                city=business_data.get("city"),
-                district=business_data.get("district"),
-                phone=business_data.get("phone"),
-                website=business_data.get("website"),
-                rating=business_data.get("rating"),
-                total_ratings=business_data.get("total_ratings", 0),
-                business_type=business_data["business_type"],
-                latitude=business_data.get("latitude"),
-                longitude=business_data.get("longitude"),
-                user_id=current_user.id if current_user else None
-            )
-            db.add(new_business)
-            new_count += 1
-            saved_businesses.append(new_business)
-    
-    db.commit()
+    # Veritabanına toplu kaydet (mükerrer kontrolü ile, tek yazıcı kuyruğunda)
+    new_count, duplicate_count, saved_businesses = await run_write(
+        bulk_ingest,
+        found_businesses,
+        user_id=current_user.id if current_user else None,
+        response_limit=100
+    )
     
-    # Refresh all
-    for b in saved_businesses:
-        db.refresh(b)
+    cache_status = search_pipeline.cache_status(search_stats)
     
     return SearchResponse(
         success=True,
-        message=f"{new_count} yeni işletme eklendi, {duplicate_count} mükerrer atlandı",
+        message=(
+            f"{new_count} yeni işletme eklendi, {duplicate_count} mükerrer atlandı "
+            f"(önbellek: {cache_status})"
+        ),
+        cache_status=cache_status,
+        truncated=search_stats.get("truncated", False),
         new_count=new_count,
         duplicate_count=duplicate_count,
         total_found=len(found_businesses),
-        businesses=[BusinessResponse.model_validate(b) for b in saved_businesses[:100]]
+        businesses=[BusinessResponse.model_validate(b) for b in saved_businesses]
     )
+
+
+@router.post("/stream")
+async def search_businesses_stream(
+    request: SearchRequest,
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$"),
+    current_user: User = Depends(get_current_user_optional)
+):
+    """İşletme ara, sonuçları geldikçe kaydet ve akış olarak gönder (NDJSON veya SSE)
+
+    Olaylar: geocode, her upstream partisi için batch (kaydedilmiş işletmeler + yeni/mükerrer),
+    sonda done (toplamlar, önbellek durumu ve truncated); hata olursa error ile biter.
+    """
+    try:
+        search_pipeline.center_source(
+            request.location, request.latitude, request.longitude, request.polygon
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    events = _search_events(request, current_user.id if current_user else None)
+    if format == "sse":
+        return StreamingResponse(
+            _sse_lines(events),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    return StreamingResponse(
+        _ndjson_lines(events),
+        media_type="application/x-ndjson",
+        headers={"X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/jobs", response_model=SearchJobResponse, status_code=202)
+async def create_search_job(
+    request: SearchRequest,
+    response: Response,
+    current_user: User = Depends(get_current_user_optional)
+):
+    """Aramayı kalıcı kuyruğa al (aynı parametreli bekleyen/çalışan iş varsa o döner, 200)"""
+    try:
+        search_pipeline.center_source(
+            request.location, request.latitude, request.longitude, request.polygon
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    job, created = await search_jobs.submit(
+        _pipeline_params(request),
+        user_id=current_user.id if current_user else None
+    )
+    if not created:
+        response.status_code = 200
+    return SearchJobResponse(**job)
+
+
+@router.get("/jobs/{job_id}", response_model=SearchJobResponse)
+def get_search_job(job_id: str, db: Session = Depends(get_read_db)):
+    """Arama işinin durumu ve ilerlemesi (parti, bulunan, yeni, mükerrer)"""
+    job = search_jobs.get(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="İş bulunamadı veya süresi doldu")
+    return SearchJobResponse(**job)
+
+
+def _pipeline_params(request: SearchRequest) -> Dict:
+    """Arama hattı parametreleri (akışlı arama ve arka plan işleri için ortak)"""
+    return {
+        "location": request.location,
+        "latitude": request.latitude,
+        "longitude": request.longitude,
+        "polygon": request.polygon,
+        "business_type": request.business_type,
+        "radius": request.radius,
+        "max_results": request.max_results,
+        "tiled": request.tiled,
+        "max_age_hours": request.max_age_hours,
+    }
+
+
+async def _search_events(request: SearchRequest, user_id) -> AsyncIterator[Dict]:
+    """Arama hattının olaylarını yanıt biçimine çevir"""
+    try:
+        async for event in search_pipeline.stream(**_pipeline_params(request), user_id=user_id):
+            if event["event"] == "batch":
+                event["businesses"] = [
+                    BusinessResponse.model_validate(b).model_dump(mode="json")
+                    for b in event["businesses"]
+                ]
+            elif event["event"] == "done":
+                stats = event.pop("stats")
+                cache_status = search_pipeline.cache_status(stats)
+                event["cache_status"] = cache_status
+                event["truncated"] = stats.get("truncated", False)
+                event["message"] = (
+                    f"{event['new_count']} yeni işletme eklendi, "
+                    f"{event['duplicate_count']} mükerrer atlandı (önbellek: {cache_status})"
+                )
+            yield event
+    except ValueError as e:
+        yield {"event": "error", "detail": str(e)}
+    except GeocodeUnavailable:
+        yield {"event": "error", "detail": "Konum servisine şu anda ulaşılamıyor"}
+    except Exception as e:
+        logger.error(f"Akışlı arama hatası: {e}")
+        yield {"event": "error", "detail": "Arama sırasında hata oluştu"}
+
+
+async def _ndjson_lines(events: AsyncIterator[Dict]) -> AsyncIterator[bytes]:
+    """Her olay bir JSON satırı"""
+    async for event in events:
+        yield (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+async def _sse_lines(events: AsyncIterator[Dict]) -> AsyncIterator[bytes]:
+    """Server-Sent Events: olay adı + JSON veri"""
+    async for event in events:
+        payload = json.dumps(event, ensure_ascii=False)
+        yield f"event: {event['event']}\ndata: {payload}\n\n".encode("utf-8")
+
@@ -0,0 +1,56 @@
+"""
+Seçim API Endpoint'leri
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db, get_read_db
+from app.core.security import get_current_user_optional
+from app.models.business import Business
+from app.models.user import User
+from app.schemas.business import SelectionCreate, SelectionResponse
+from app.services.selections import selection_service
+
+router = APIRouter()
+
+
+@router.post("/", response_model=SelectionResponse, status_code=201)
+def create_selection(
+    request: SelectionCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_optional)
+):
+    """Filtre + dahil/hariç ID'lerden seçim oluştur, token döndür"""
+    try:
+        selection = selection_service.create(
+            db,
+            filters=request.filters.model_dump() if request.filters else None,
+            include_ids=request.include_ids,
+            exclude_ids=request.exclude_ids,
+            user_id=current_user.id if current_user else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SelectionResponse(**selection_service.summary(selection))
+
+
+@router.get("/{token}", response_model=SelectionResponse)
+def get_selection(token: str, db: Session = Depends(get_read_db)):
+    """Seçim özeti"""
+    selection = selection_service.get(db, token)
+    if not selection:
+        raise HTTPException(status_code=404, detail="Seçim bulunamadı veya süresi doldu")
+    return SelectionResponse(**selection_service.summary(selection))
+
+
+@router.delete("/{token}/businesses")
+def delete_selected_businesses(token: str, db: Session = Depends(get_db)):
+    """Seçimdeki tüm işletmeleri sil"""
+    selection = selection_service.get(db, token)
+    if not selection:
+        raise HTTPException(status_code=404, detail="Seçim bulunamadı veya süresi doldu")
+    
+    count = selection_service.apply(db.query(Business), selection).delete(synchronize_session=False)
+    db.commit()
+    return {"message": f"{count} işletme silindi"}
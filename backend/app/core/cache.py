@@ -0,0 +1,56 @@
+"""
+Bellek içi önbellek yardımcıları
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class VersionedLRUCache:
+    """Sürüm etiketli, ağırlık sınırlı LRU önbellek - thread güvenli
+
+    Kayıt yalnızca yazıldığı sürümle okunursa geçerlidir; sürüm değişince kendiliğinden eskir.
+    """
+
+    def __init__(self, max_entries: int, max_weight: int):
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: int) -> Optional[Any]:
+        """Aynı sürümde yazılmış değeri döndür (yoksa/eskiyse None)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, entry_version, weight = entry
+            if entry_version != version:
+                del self._data[key]
+                self._weight -= weight
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, version: int, value: Any, weight: int = 1) -> bool:
+        """Değeri yaz, sınırlar aşılırsa en eskileri at (tek başına sınırı aşan değer yazılmaz)"""
+        if weight > self.max_weight:
+            return False
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._weight -= old[2]
+            self._data[key] = (value, version, weight)
+            self._weight += weight
+            while len(self._data) > self.max_entries or self._weight > self.max_weight:
+                _, (_, _, evicted_weight) = self._data.popitem(last=False)
+                self._weight -= evicted_weight
+            return True
+
+    def clear(self):
+        """Tüm kayıtları sil"""
+        with self._lock:
+            self._data.clear()
+            self._weight = 0
@@ -3,6 +3,7 @@ Uygulama yapılandırması
 """
 
 import os
+import tempfile
 from typing import Optional
 
 # JWT ayarları
@@ -12,3 +13,71 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 gün
 
 # API ayarları
 API_PREFIX = "/api"
+
+# OpenStreetMap HTTP istemcisi (bağlantı havuzu)
+OSM_HTTP_MAX_CONNECTIONS = int(os.getenv("OSM_HTTP_MAX_CONNECTIONS", "20"))
+OSM_HTTP_MAX_KEEPALIVE = int(os.getenv("OSM_HTTP_MAX_KEEPALIVE", "10"))
+OSM_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("OSM_HTTP_KEEPALIVE_EXPIRY", "30"))
+OSM_HTTP_TIMEOUT = float(os.getenv("OSM_HTTP_TIMEOUT", "60"))
+OSM_HTTP2 = os.getenv("OSM_HTTP2", "false").lower() in ("1", "true", "yes")
+
+# Upstream hız sınırları (Overpass / Nominatim kullanım politikaları)
+OVERPASS_RATE_PER_SECOND = float(os.getenv("OVERPASS_RATE_PER_SECOND", "2"))
+OVERPASS_BURST = int(os.getenv("OVERPASS_BURST", "2"))
+OVERPASS_MAX_CONCURRENT = int(os.getenv("OVERPASS_MAX_CONCURRENT", "2"))  # IP başına slot sayısı
+# 429/504 sonrası geri çekilme (Retry-After / slot durumu yoksa üstel) ve yeniden deneme sayısı
+OVERPASS_BACKOFF_BASE_SECONDS = float(os.getenv("OVERPASS_BACKOFF_BASE_SECONDS", "5"))
+OVERPASS_BACKOFF_MAX_SECONDS = float(os.getenv("OVERPASS_BACKOFF_MAX_SECONDS", "120"))
+OVERPASS_OVERLOAD_RETRIES = int(os.getenv("OVERPASS_OVERLOAD_RETRIES", "2"))
+NOMINATIM_RATE_PER_SECOND = float(os.getenv("NOMINATIM_RATE_PER_SECOND", "1"))
+
+# Geocode önbelleği (bellek içi LRU + SQLite)
+GEOCODE_CACHE_MAX_ENTRIES = int(os.getenv("GEOCODE_CACHE_MAX_ENTRIES", "2048"))
+GEOCODE_CACHE_TTL_DAYS = int(os.getenv("GEOCODE_CACHE_TTL_DAYS", "30"))
+
+# Overpass yanıt önbelleği (SQLite, sıkıştırılmış)
+OVERPASS_CACHE_TTL_HOURS = float(os.getenv("OVERPASS_CACHE_TTL_HOURS", "24"))
+OVERPASS_CACHE_MAX_MB = float(os.getenv("OVERPASS_CACHE_MAX_MB", "200"))
+OVERPASS_CACHE_PRECISION = int(os.getenv("OVERPASS_CACHE_PRECISION", "3"))  # koordinat ondalık basamağı
+
+# Büyük alanlar için tile bazlı paralel arama
+OVERPASS_TILE_SIZE_DEG = float(os.getenv("OVERPASS_TILE_SIZE_DEG", "0.1"))
+OVERPASS_TILE_THRESHOLD_M = int(os.getenv("OVERPASS_TILE_THRESHOLD_M", "10000"))  # otomatik bölme eşiği
+OVERPASS_TILE_MAX_ELEMENTS = int(os.getenv("OVERPASS_TILE_MAX_ELEMENTS", "2000"))  # max_results'tan küçükse tile limiti
+OVERPASS_TILE_MAX_SPLITS = int(os.getenv("OVERPASS_TILE_MAX_SPLITS", "2"))  # limitte kesilen tile'ın bölünme kademesi
+
+# Kapsama indeksi: taze ve tamamen kapsanan aramalar yerel veritabanından yanıtlanır
+COVERAGE_MAX_AGE_HOURS = float(os.getenv("COVERAGE_MAX_AGE_HOURS", "24"))  # tazelik penceresi
+COVERAGE_RETENTION_DAYS = float(os.getenv("COVERAGE_RETENTION_DAYS", "7"))
+
+# Akışlı arama: upstream partileri bu boyutta parçalar halinde kaydedilip yayınlanır
+SEARCH_STREAM_BATCH_SIZE = int(os.getenv("SEARCH_STREAM_BATCH_SIZE", "200"))
+
+# Arka plan arama işleri (SQLite'ta kalıcı kuyruk, sınırlı eşzamanlı işçi)
+SEARCH_JOB_WORKERS = int(os.getenv("SEARCH_JOB_WORKERS", "2"))
+SEARCH_JOB_MAX_ATTEMPTS = int(os.getenv("SEARCH_JOB_MAX_ATTEMPTS", "3"))
+SEARCH_JOB_RETRY_BASE_SECONDS = float(os.getenv("SEARCH_JOB_RETRY_BASE_SECONDS", "30"))  # üstel geri çekilme tabanı
+SEARCH_JOB_POLL_SECONDS = float(os.getenv("SEARCH_JOB_POLL_SECONDS", "5"))
+SEARCH_JOB_RETENTION_HOURS = float(os.getenv("SEARCH_JOB_RETENTION_HOURS", "24"))
+
+# SQLite depolama ayarları (WAL, okuma havuzu)
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "8"))
+
+# Filtre sonuç kümesi önbelleği (veri sürümüyle geçersizleşir)
+FILTER_CACHE_MAX_ENTRIES = int(os.getenv("FILTER_CACHE_MAX_ENTRIES", "128"))
+FILTER_CACHE_MAX_IDS = int(os.getenv("FILTER_CACHE_MAX_IDS", "5000000"))  # tüm kayıtlardaki toplam ID
+FILTER_COUNT_CACHE_MAX_ENTRIES = int(os.getenv("FILTER_COUNT_CACHE_MAX_ENTRIES", "1024"))  # liste toplamları
+
+# Dışa aktarım: veritabanından parça parça okunan satır sayısı
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))
+
+# Arka plan dışa aktarım işleri (dosyalar diskte, süre dolunca silinir)
+EXPORT_JOB_DIR = os.getenv("EXPORT_JOB_DIR", os.path.join(tempfile.gettempdir(), "bizfinder_exports"))
+EXPORT_JOB_WORKERS = int(os.getenv("EXPORT_JOB_WORKERS", "2"))
+EXPORT_JOB_TTL_MINUTES = float(os.getenv("EXPORT_JOB_TTL_MINUTES", "60"))
+
+# Sunucu tarafı seçimler (token ile adreslenen ID kümeleri)
+SELECTION_TTL_HOURS = float(os.getenv("SELECTION_TTL_HOURS", "24"))
@@ -3,31 +3,94 @@ Veritabanı bağlantı yapılandırması - SQLite
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import os
 
+from app.core.config import SQLITE_READ_POOL_SIZE
+from app.core.storage import configure_engine
+
 # Veritabanı dosyası yolu
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATABASE_URL = f"sqlite:///{os.path.join(BASE_DIR, 'business_finder.db')}"
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{os.path.join(BASE_DIR, 'business_finder.db')}"
 
-# Engine oluştur
+# Yazıcı engine - tek bağlantı: tüm senkron yazmalar bu bağlantı üzerinden sıralanır
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False},
+    pool_size=1,
+    max_overflow=0,
+    pool_timeout=60
 )
+configure_engine(engine)
+
+# Okuyucu engine - salt okunur bağlantı havuzu (WAL sayesinde yazıcıyı beklemez)
+read_engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=SQLITE_READ_POOL_SIZE,
+    max_overflow=0
+)
+configure_engine(read_engine, read_only=True)
+
+# Async engine (aiosqlite) - event loop'u bloklamayan okumalar için; salt okunur,
+# yazmalar run_write ile yazıcı kuyruğundan geçer
+async_engine = create_async_engine(ASYNC_DATABASE_URL)
+configure_engine(async_engine.sync_engine, read_only=True)
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
 
 # Base class
 Base = declarative_base()
 
 
 def get_db():
-    """Veritabanı oturumu sağlayıcı"""
+    """Veritabanı oturumu sağlayıcı (yazıcı bağlantı)"""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Salt okunur veritabanı oturumu sağlayıcı (okuma havuzu)"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """Async salt okunur veritabanı oturumu sağlayıcı"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Tek yazıcı kuyruğu - async koddan gelen yazmalar sırayla tek thread'de çalışır
+_writer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+
+
+async def run_write(fn, *args, **kwargs):
+    """`fn(db, *args, **kwargs)` çağrısını yazıcı kuyruğunda çalıştır ve sonucunu döndür"""
+    def _call():
+        db = SessionLocal()
+        try:
+            return fn(db, *args, **kwargs)
+        finally:
+            db.close()
+
+    return await asyncio.get_running_loop().run_in_executor(_writer_executor, _call)
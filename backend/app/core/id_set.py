@@ -0,0 +1,77 @@
+"""
+Sıkıştırılmış ID kümeleri
+Sıralı ID'ler aralıklara, aralıklar fark kodlu varint'lere çevrilip zlib ile sıkıştırılır
+"""
+
+import zlib
+from typing import Iterable, Iterator, List, Tuple
+
+# (başlangıç, bitiş) kapalı aralık
+IdRange = Tuple[int, int]
+
+
+def to_ranges(ids: Iterable[int]) -> List[IdRange]:
+    """ID'leri sıralı, birleşik aralıklara çevir"""
+    ranges: List[List[int]] = []
+    for value in sorted(set(ids)):
+        if ranges and value == ranges[-1][1] + 1:
+            ranges[-1][1] = value
+        else:
+            ranges.append([value, value])
+    return [(start, end) for start, end in ranges]
+
+
+def iter_ids(ranges: Iterable[IdRange]) -> Iterator[int]:
+    """Aralıkları tek tek ID'lere aç"""
+    for start, end in ranges:
+        yield from range(start, end + 1)
+
+
+def count_ids(ranges: Iterable[IdRange]) -> int:
+    """Aralıklardaki toplam ID sayısı"""
+    return sum(end - start + 1 for start, end in ranges)
+
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varints(data: bytes) -> Iterator[int]:
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield value
+            value = shift = 0
+
+
+def encode_id_set(ids: Iterable[int]) -> bytes:
+    """ID kümesini kompakt ikili forma çevir (yalnızca negatif olmayan ID'ler)"""
+    ranges = to_ranges(ids)
+    if ranges and ranges[0][0] < 0:
+        raise ValueError(f"ID kümesi negatif değer içeremez: {ranges[0][0]}")
+    out = bytearray()
+    previous = 0
+    for start, end in ranges:
+        _write_varint(out, start - previous)
+        _write_varint(out, end - start)
+        previous = end
+    return zlib.compress(bytes(out))
+
+
+def decode_id_set(data: bytes) -> List[IdRange]:
+    """İkili formdan aralık listesine geri çevir"""
+    values = list(_read_varints(zlib.decompress(data)))
+    ranges = []
+    previous = 0
+    for i in range(0, len(values), 2):
+        start = previous + values[i]
+        end = start + values[i + 1]
+        ranges.append((start, end))
+        previous = end
+    return ranges
@@ -0,0 +1,284 @@
+"""
+Veritabanı şeması kurulumu
+ORM tabloları + SQLite'a özgü yapılar (FTS5 ve R*Tree indeksleri, istatistik ve sürüm tetikleyicileri)
++ hafif migration'lar
+"""
+
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core.database import Base
+from app.core.text import fold_text
+from app.models.business import Business
+import app.models  # noqa: F401  (tüm modeller metadata'ya kaydolsun)
+
+logger = logging.getLogger(__name__)
+
+# İsim/adres tam metin indeksi - rowid = businesses.id
+# Tetikleyiciler yalnızca yerleşik SQL kullanır (veritabanı sqlite3 CLI / yedekleme araçlarıyla da
+# yazılabilir): unicode61 + remove_diacritics büyük/küçük harf ve ş, ğ, ü, ö, ç, İ'yi katlar,
+# geriye kalan noktasız ı replace() ile i'ye çevrilir; sonuç fold_text ile aynı token'ları verir.
+def _fts_text(column: str) -> str:
+    return f"replace({column}, 'ı', 'i')"
+
+
+FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS businesses_fts USING fts5(
+        name, address,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS businesses_fts_ai AFTER INSERT ON businesses BEGIN
+        INSERT INTO businesses_fts(rowid, name, address)
+        VALUES (new.id, {_fts_text('new.name')}, {_fts_text('new.address')});
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS businesses_fts_ad AFTER DELETE ON businesses BEGIN
+        DELETE FROM businesses_fts WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS businesses_fts_au AFTER UPDATE OF name, address ON businesses BEGIN
+        DELETE FROM businesses_fts WHERE rowid = old.id;
+        INSERT INTO businesses_fts(rowid, name, address)
+        VALUES (new.id, {_fts_text('new.name')}, {_fts_text('new.address')});
+    END
+    """,
+]
+
+
+# Koordinat indeksi - id = businesses.id, noktalar için min = max
+RTREE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS businesses_rtree USING rtree(
+        id, min_lat, max_lat, min_lon, max_lon
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS businesses_rtree_ai AFTER INSERT ON businesses
+    WHEN new.latitude IS NOT NULL AND new.longitude IS NOT NULL BEGIN
+        INSERT INTO businesses_rtree(id, min_lat, max_lat, min_lon, max_lon)
+        VALUES (new.id, new.latitude, new.latitude, new.longitude, new.longitude);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS businesses_rtree_ad AFTER DELETE ON businesses BEGIN
+        DELETE FROM businesses_rtree WHERE id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS businesses_rtree_au AFTER UPDATE OF latitude, longitude ON businesses BEGIN
+        DELETE FROM businesses_rtree WHERE id = old.id;
+        INSERT INTO businesses_rtree(id, min_lat, max_lat, min_lon, max_lon)
+        SELECT new.id, new.latitude, new.latitude, new.longitude, new.longitude
+        WHERE new.latitude IS NOT NULL AND new.longitude IS NOT NULL;
+    END
+    """,
+]
+
+
+# Bir satırın istatistiklere katkısı: sign = 1 (ekle) / -1 (çıkar), row = new / old
+def _stats_delta(sign: str, row: str) -> str:
+    return f"""
+        UPDATE business_stats SET
+            total = total {sign} 1,
+            with_phone = with_phone {sign} (coalesce({row}.phone, '') != ''),
+            with_website = with_website {sign} (coalesce({row}.website, '') != ''),
+            rating_sum = rating_sum {sign} coalesce({row}.rating, 0),
+            rating_count = rating_count {sign} ({row}.rating IS NOT NULL)
+        WHERE id = 1;
+        INSERT INTO business_city_stats(city, count)
+            SELECT {row}.city, {sign} 1 WHERE coalesce({row}.city, '') != ''
+            ON CONFLICT(city) DO UPDATE SET count = count {sign} 1;
+        INSERT INTO business_category_stats(business_type, count)
+            SELECT {row}.business_type, {sign} 1 WHERE {row}.business_type IS NOT NULL
+            ON CONFLICT(business_type) DO UPDATE SET count = count {sign} 1;
+    """
+
+
+_STATS_CLEANUP = """
+        DELETE FROM business_city_stats WHERE city = old.city AND count <= 0;
+        DELETE FROM business_category_stats WHERE business_type = old.business_type AND count <= 0;
+"""
+
+# İstatistikler yazma işlemiyle aynı transaction içinde güncellenir
+STATS_DDL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS business_stats_ai AFTER INSERT ON businesses BEGIN
+        {_stats_delta("+", "new")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS business_stats_ad AFTER DELETE ON businesses BEGIN
+        {_stats_delta("-", "old")}
+        {_STATS_CLEANUP}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS business_stats_au
+    AFTER UPDATE OF phone, website, rating, city, business_type ON businesses BEGIN
+        {_stats_delta("-", "old")}
+        {_stats_delta("+", "new")}
+        {_STATS_CLEANUP}
+    END
+    """,
+]
+
+
+# Filtre sonuç önbelleği için veri sürümü: filtrelenen kolonlardan biri değişince artar
+_VERSION_BUMP = "UPDATE data_version SET version = version + 1 WHERE id = 1;"
+
+VERSION_DDL = [
+    "INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS data_version_ai AFTER INSERT ON businesses BEGIN
+        {_VERSION_BUMP}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS data_version_ad AFTER DELETE ON businesses BEGIN
+        {_VERSION_BUMP}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS data_version_au
+    AFTER UPDATE OF name, address, city, business_type, phone, website, rating,
+        latitude, longitude, created_at ON businesses BEGIN
+        {_VERSION_BUMP}
+    END
+    """,
+]
+
+
+# Sonradan eklenen normalize kolonlar: (kolon, tip, kaynak kolon)
+BUSINESS_ADDED_COLUMNS = [
+    ("city_norm", "VARCHAR(100)", "city"),
+    ("business_type_norm", "VARCHAR(100)", "business_type"),
+]
+
+
+def _migrate_business_columns(conn):
+    """Eski veritabanlarına eksik kolonları ekle ve mevcut satırları doldur"""
+    existing = {row[1] for row in conn.execute(text("PRAGMA table_info(businesses)"))}
+    for name, column_type, source in BUSINESS_ADDED_COLUMNS:
+        if name in existing:
+            continue
+        conn.execute(text(f"ALTER TABLE businesses ADD COLUMN {name} {column_type}"))
+        # Değerler Python'da (fold_text) hesaplanır: veritabanında uygulamaya özgü fonksiyon kalmaz
+        rows = conn.execute(text(f"SELECT id, {source} FROM businesses")).all()
+        if rows:
+            conn.execute(
+                text(f"UPDATE businesses SET {name} = :value WHERE id = :id"),
+                [{"id": row_id, "value": fold_text(value)} for row_id, value in rows]
+            )
+        logger.info(f"businesses.{name} kolonu eklendi ve dolduruldu")
+
+    # create_all var olan tabloya yeni indeksleri eklemez
+    for index in Business.__table__.indexes:
+        index.create(bind=conn, checkfirst=True)
+
+
+def _sync_fts(conn):
+    """İndeks tablo ile uyumsuzsa (ilk kurulum) yeniden doldur"""
+    indexed = conn.execute(text("SELECT count(*) FROM businesses_fts")).scalar()
+    total = conn.execute(text("SELECT count(*) FROM businesses")).scalar()
+    if indexed == total:
+        return
+    conn.execute(text("DELETE FROM businesses_fts"))
+    conn.execute(text(
+        "INSERT INTO businesses_fts(rowid, name, address) "
+        f"SELECT id, {_fts_text('name')}, {_fts_text('address')} FROM businesses"
+    ))
+    logger.info(f"FTS indeksi yeniden oluşturuldu ({total} kayıt)")
+
+
+def _drop_app_function_triggers(conn):
+    """Uygulamaya özgü SQL fonksiyonu (tr_fold) çağıran eski tetikleyicileri kaldır
+
+    Bu tetikleyiciler uygulama dışından yapılan her yazımı "no such function" ile
+    reddeder; yerlerine yerleşik SQL kullanan sürümleri oluşturulur.
+    """
+    names = conn.execute(text(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND sql LIKE '%tr_fold(%'"
+    )).scalars().all()
+    for name in names:
+        conn.execute(text(f'DROP TRIGGER IF EXISTS "{name}"'))
+    if names:
+        logger.info(f"tr_fold kullanan tetikleyiciler yenilendi: {', '.join(names)}")
+
+
+def _sync_rtree(conn):
+    """Koordinat indeksi tabloyla uyumsuzsa yeniden doldur"""
+    indexed = conn.execute(text("SELECT count(*) FROM businesses_rtree")).scalar()
+    total = conn.execute(text(
+        "SELECT count(*) FROM businesses WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+    )).scalar()
+    if indexed == total:
+        return
+    conn.execute(text("DELETE FROM businesses_rtree"))
+    conn.execute(text(
+        "INSERT INTO businesses_rtree(id, min_lat, max_lat, min_lon, max_lon) "
+        "SELECT id, latitude, latitude, longitude, longitude FROM businesses "
+        "WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+    ))
+    logger.info(f"R*Tree indeksi yeniden oluşturuldu ({total} kayıt)")
+
+
+def rebuild_stats(conn):
+    """İstatistik tablolarını tek geçişlik toplama ile yeniden oluştur"""
+    conn.execute(text("DELETE FROM business_stats"))
+    conn.execute(text("DELETE FROM business_city_stats"))
+    conn.execute(text("DELETE FROM business_category_stats"))
+    conn.execute(text("""
+        INSERT INTO business_stats(id, total, with_phone, with_website, rating_sum, rating_count)
+        SELECT 1,
+               count(*),
+               coalesce(sum(coalesce(phone, '') != ''), 0),
+               coalesce(sum(coalesce(website, '') != ''), 0),
+               coalesce(sum(rating), 0),
+               count(rating)
+        FROM businesses
+    """))
+    conn.execute(text("""
+        INSERT INTO business_city_stats(city, count)
+        SELECT city, count(*) FROM businesses WHERE coalesce(city, '') != '' GROUP BY city
+    """))
+    conn.execute(text("""
+        INSERT INTO business_category_stats(business_type, count)
+        SELECT business_type, count(*) FROM businesses WHERE business_type IS NOT NULL GROUP BY business_type
+    """))
+
+
+def _sync_stats(conn):
+    """Sayaç satırı yoksa ya da tabloyla uyumsuzsa yeniden oluştur"""
+    stored = conn.execute(text("SELECT total FROM business_stats WHERE id = 1")).scalar()
+    total = conn.execute(text("SELECT count(*) FROM businesses")).scalar()
+    if stored == total:
+        return
+    rebuild_stats(conn)
+    logger.info(f"İstatistikler yeniden oluşturuldu ({total} kayıt)")
+
+
+def init_db(engine: Engine):
+    """Tabloları, indeksleri ve tetikleyicileri oluştur (idempotent)"""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        _migrate_business_columns(conn)
+        _drop_app_function_triggers(conn)
+        for ddl in FTS_DDL:
+            conn.execute(text(ddl))
+        _sync_fts(conn)
+        for ddl in RTREE_DDL:
+            conn.execute(text(ddl))
+        _sync_rtree(conn)
+        for ddl in STATS_DDL:
+            conn.execute(text(ddl))
+        _sync_stats(conn)
+        for ddl in VERSION_DDL:
+            conn.execute(text(ddl))
@@ -0,0 +1,58 @@
+"""
+SQLite depolama yapılandırması
+Bağlantı açılışında WAL ve performans pragma'larını uygular, SQL fonksiyonlarını kaydeder
+"""
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import (
+    SQLITE_MMAP_SIZE,
+    SQLITE_CACHE_SIZE_KB,
+    SQLITE_BUSY_TIMEOUT_MS
+)
+from app.services.geo import haversine_m
+
+
+def register_functions(dbapi_connection):
+    """Sorguların kullandığı Python SQL fonksiyonlarını kaydet
+
+    Tetikleyiciler ve migration'lar bu fonksiyonlara dayanmaz: veritabanı uygulama
+    dışındaki araçlarla da yazılabilir kalır.
+    """
+    # haversine_m: R*Tree ön filtresinden sonra kesin mesafe kontrolü
+    dbapi_connection.create_function("haversine_m", 4, _haversine_or_null, deterministic=True)
+
+
+def _haversine_or_null(lat1, lon1, lat2, lon2):
+    """NULL koordinatlarda NULL döndüren haversine (SQL fonksiyonu)"""
+    if None in (lat1, lon1, lat2, lon2):
+        return None
+    return haversine_m(lat1, lon1, lat2, lon2)
+
+
+def apply_pragmas(dbapi_connection, read_only: bool = False):
+    """Tek bir DBAPI bağlantısına pragma'ları uygula"""
+    cursor = dbapi_connection.cursor()
+    try:
+        # WAL: okuyucular yazıcıyı, yazıcı okuyucuları beklemez
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        # Negatif değer KiB cinsinden sayfa önbelleği
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
+
+def configure_engine(engine: Engine, read_only: bool = False):
+    """Engine'in her yeni bağlantısında pragma'ları uygula"""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, read_only=read_only)
+        register_functions(dbapi_connection)
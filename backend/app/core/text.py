@@ -0,0 +1,45 @@
+"""
+Türkçe metin normalizasyonu
+Önbellek anahtarları ve aranabilir alanlar için ortak yardımcılar
+"""
+
+import re
+import unicodedata
+from typing import List, Optional
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"\w+")
+
+# Türkçeye özgü harflerin ASCII karşılıkları (küçük harfe çevrildikten sonra)
+_TURKISH_FOLD = str.maketrans({"ı": "i", "ş": "s", "ğ": "g", "ü": "u", "ö": "o", "ç": "c"})
+
+
+def turkish_lower(text: str) -> str:
+    """Türkçe kurallarına göre küçük harfe çevir (İ -> i, I -> ı)"""
+    return text.replace("İ", "i").replace("I", "ı").lower()
+
+
+def normalize_key(text: Optional[str]) -> str:
+    """Türkçe küçük harf + boşlukları sadeleştir (önbellek anahtarı)"""
+    if not text:
+        return ""
+    return _WHITESPACE_RE.sub(" ", turkish_lower(text)).strip()
+
+
+def fold_text(text: Optional[str]) -> str:
+    """Türkçe küçük harf + aksan/diakritik kaldırma + boşluk sadeleştirme
+
+    "İSTANBUL", "istanbul" ve "Istanbul" gibi yazımları aynı forma indirger
+    (arama indeksleri ve normalize kolonlar için).
+    """
+    if not text:
+        return ""
+    folded = turkish_lower(text).translate(_TURKISH_FOLD)
+    folded = unicodedata.normalize("NFKD", folded)
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch))
+    return _WHITESPACE_RE.sub(" ", folded).strip()
+
+
+def search_tokens(text: Optional[str]) -> List[str]:
+    """Arama metnini normalize edilmiş kelimelere ayır"""
+    return _TOKEN_RE.findall(fold_text(text))
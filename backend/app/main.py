@@ -7,18 +7,32 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
-from app.core.database import engine, Base
-from app.api import search, businesses, exports, auth
+from app.core.database import engine, async_engine
+from app.core.schema import init_db
+from app.api import search, businesses, exports, selections, auth
+from app.services.osm_service import osm_service
+from app.services.export_jobs import export_jobs
+from app.services.search_jobs import search_jobs
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Uygulama başlangıç ve kapanış işlemleri"""
-    # Veritabanı tablolarını oluştur
-    Base.metadata.create_all(bind=engine)
+    # Veritabanı tabloları, indeksler ve tetikleyiciler
+    init_db(engine)
     print("✅ Veritabanı tabloları oluşturuldu")
+    # Paylaşılan OSM HTTP istemcisi
+    await osm_service.startup()
+    # Arka plan dışa aktarım iş havuzu
+    export_jobs.startup()
+    # Kalıcı arama iş kuyruğu işçileri (yarım kalan işler yeniden kuyruğa alınır)
+    await search_jobs.startup()
     yield
     print("👋 Uygulama kapatılıyor...")
+    await search_jobs.shutdown()
+    export_jobs.shutdown()
+    await osm_service.shutdown()
+    await async_engine.dispose()
 
 
 app = FastAPI(
@@ -42,6 +56,7 @@ app.include_router(auth.router, prefix="/api/auth", tags=["Kimlik Doğrulama"])
 app.include_router(search.router, prefix="/api/search", tags=["Arama"])
 app.include_router(businesses.router, prefix="/api/businesses", tags=["İşletmeler"])
 app.include_router(exports.router, prefix="/api/exports", tags=["Dışa Aktarım"])
+app.include_router(selections.router, prefix="/api/selections", tags=["Seçimler"])
 
 
 @app.get("/")
@@ -1,5 +1,14 @@
 # Modeller
 from app.models.business import Business
 from app.models.user import User
+from app.models.cache import GeocodeCache, OverpassCache
+from app.models.stats import BusinessStats, DataVersion, CityStats, CategoryStats
+from app.models.coverage import SearchCoverage
+from app.models.selection import Selection
+from app.models.search_job import SearchJob
 
-__all__ = ["Business", "User"]
+__all__ = [
+    "Business", "User", "GeocodeCache", "OverpassCache",
+    "BusinessStats", "DataVersion", "CityStats", "CategoryStats", "SearchCoverage",
+    "Selection", "SearchJob"
+]
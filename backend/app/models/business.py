@@ -2,16 +2,29 @@
 İşletme veritabanı modeli
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Index
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 
 from app.core.database import Base
+from app.core.text import fold_text
+
+
+def _folded(source: str):
+    """Kaynak kolonun normalize halini yazma anında üreten varsayılan değer"""
+    def default(context):
+        return fold_text(context.get_current_parameters().get(source))
+    return default
 
 
 class Business(Base):
     """İşletme modeli"""
     __tablename__ = "businesses"
+    __table_args__ = (
+        Index("ix_businesses_city_type_created", "city_norm", "business_type_norm", "created_at"),
+        Index("ix_businesses_type_created", "business_type_norm", "created_at"),
+        Index("ix_businesses_created_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     place_id = Column(String(255), unique=True, index=True, nullable=False)
@@ -27,6 +40,10 @@ class Business(Base):
     latitude = Column(Float)
     longitude = Column(Float)
     
+    # Filtreleme için normalize kolonlar (Türkçe küçük harf, aksansız)
+    city_norm = Column(String(100), default=_folded("city"))
+    business_type_norm = Column(String(100), default=_folded("business_type"))
+    
     # Kullanıcı eklentileri
     notes = Column(Text)
     tags = Column(String(500))
@@ -38,6 +55,12 @@ class Business(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    @validates("city", "business_type")
+    def _sync_norm(self, key, value):
+        """Kaynak kolon değişince normalize kolonu da güncelle (ORM yazımları)"""
+        setattr(self, f"{key}_norm", fold_text(value))
+        return value
+
     def to_dict(self):
         """Dictionary'ye çevir"""
         return {
@@ -0,0 +1,32 @@
+"""
+Önbellek veritabanı modelleri
+"""
+
+from sqlalchemy import Column, String, Float, DateTime, Integer, Text, LargeBinary
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class GeocodeCache(Base):
+    """Geocode sonuç önbelleği (normalize edilmiş lokasyon -> koordinat)"""
+    __tablename__ = "geocode_cache"
+
+    key = Column(String(500), primary_key=True)
+    query = Column(String(500))
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class OverpassCache(Base):
+    """Overpass yanıt önbelleği (zlib ile sıkıştırılmış element listesi)"""
+    __tablename__ = "overpass_cache"
+
+    key = Column(String(64), primary_key=True)
+    description = Column(Text)
+    payload = Column(LargeBinary, nullable=False)
+    element_count = Column(Integer, default=0)
+    size_bytes = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_accessed_at = Column(DateTime, default=datetime.utcnow, index=True)
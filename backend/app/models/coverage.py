@@ -0,0 +1,34 @@
+"""
+Arama kapsama indeksi modeli
+Tamamlanmış upstream sorgularının (filtre seti, alan, zaman) kaydı
+"""
+
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, LargeBinary, Index
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class SearchCoverage(Base):
+    """Bir filtre seti için upstream'den eksiksiz çekilmiş alan"""
+    __tablename__ = "search_coverage"
+    __table_args__ = (
+        Index("ix_search_coverage_key_fetched", "query_key", "fetched_at"),
+        Index("ix_search_coverage_key_tile", "query_key", "tile_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    query_key = Column(String(64), nullable=False)
+    description = Column(Text)
+    area_type = Column(String(20), nullable=False)  # circle, polygon, tile
+    tile_id = Column(String(50))
+    # Alanın sınır kutusu (aday ön filtresi)
+    min_lat = Column(Float, nullable=False)
+    max_lat = Column(Float, nullable=False)
+    min_lon = Column(Float, nullable=False)
+    max_lon = Column(Float, nullable=False)
+    geometry = Column(Text, nullable=False)
+    # [[place_id, lat, lon], ...] zlib ile sıkıştırılmış JSON
+    members = Column(LargeBinary, nullable=False)
+    member_count = Column(Integer, default=0)
+    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False)
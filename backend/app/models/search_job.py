@@ -0,0 +1,37 @@
+"""
+Arka plan arama işi veritabanı modeli
+Kalıcı kuyruk: yeniden başlatmada yarım kalan işler tekrar kuyruğa alınır
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class SearchJob(Base):
+    """Kuyruktaki / çalışan / biten arama işi"""
+    __tablename__ = "search_jobs"
+    __table_args__ = (
+        Index("ix_search_jobs_status_next_run", "status", "next_run_at"),
+    )
+
+    id = Column(String(32), primary_key=True)
+    # Kanonik parametrelerin özeti (aynı parametreli bekleyen işler tekilleştirilir)
+    params_hash = Column(String(64), nullable=False, index=True)
+    params = Column(Text, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    status = Column(String(20), default="queued")  # queued, running, done, failed
+    attempts = Column(Integer, default=0)
+    next_run_at = Column(DateTime, default=datetime.utcnow)
+    # İlerleme
+    batches = Column(Integer, default=0)
+    found_count = Column(Integer, default=0)
+    new_count = Column(Integer, default=0)
+    duplicate_count = Column(Integer, default=0)
+    cache_status = Column(String(20))
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,25 @@
+"""
+Seçim (selection) veritabanı modeli
+Filtre tanımı + açık dahil/hariç ID kümeleri, kısa bir token ile adreslenir
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, Text, LargeBinary, ForeignKey
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class Selection(Base):
+    """Sunucu tarafında saklanan işletme seçimi"""
+    __tablename__ = "selections"
+
+    token = Column(String(32), primary_key=True)
+    # Kanonik JSON filtre tanımı (boşsa yalnızca dahil edilen ID'ler)
+    filters = Column(Text)
+    # app.core.id_set ile kodlanmış aralıklar
+    include_ids = Column(LargeBinary)
+    exclude_ids = Column(LargeBinary)
+    total = Column(Integer, default=0)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,44 @@
+"""
+İstatistik veritabanı modelleri
+businesses tablosundaki tetikleyicilerle artımlı olarak güncellenir
+"""
+
+from sqlalchemy import Column, Integer, String, Float
+
+from app.core.database import Base
+
+
+class BusinessStats(Base):
+    """Genel sayaçlar (tek satır, id=1)"""
+    __tablename__ = "business_stats"
+
+    id = Column(Integer, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    with_phone = Column(Integer, nullable=False, default=0)
+    with_website = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Float, nullable=False, default=0)
+    rating_count = Column(Integer, nullable=False, default=0)
+
+
+class DataVersion(Base):
+    """Veri sürümü (tek satır, id=1); filtre sonucunu etkileyen her yazımda artar"""
+    __tablename__ = "data_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class CityStats(Base):
+    """Şehir bazında işletme sayısı"""
+    __tablename__ = "business_city_stats"
+
+    city = Column(String(100), primary_key=True)
+    count = Column(Integer, nullable=False, default=0, index=True)
+
+
+class CategoryStats(Base):
+    """Kategori bazında işletme sayısı"""
+    __tablename__ = "business_category_stats"
+
+    business_type = Column(String(100), primary_key=True)
+    count = Column(Integer, nullable=False, default=0, index=True)
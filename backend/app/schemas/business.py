@@ -3,7 +3,7 @@
 """
 
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List
+from typing import Annotated, Optional, List
 from datetime import datetime
 
 
@@ -17,6 +17,8 @@ class SearchRequest(BaseModel):
     keyword: Optional[str] = Field(None, max_length=100, description="Ek anahtar kelime")
     max_results: int = Field(500, ge=1, le=5000, description="Maksimum sonuç sayısı")
     polygon: Optional[List[List[float]]] = Field(None, description="Polygon koordinatları [[lat, lng], ...]")
+    tiled: Optional[bool] = Field(None, description="Alanı tile'lara bölerek ara (boşsa büyük alanlarda otomatik)")
+    max_age_hours: Optional[float] = Field(None, ge=0, description="Yerel kapsama için tazelik penceresi (saat, 0 = her zaman upstream)")
     
     @field_validator('location')
     @classmethod
@@ -70,10 +72,11 @@ class BusinessUpdate(BaseModel):
 class BusinessListResponse(BaseModel):
     """İşletme listesi yanıtı"""
     businesses: List[BusinessResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     per_page: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class SearchResponse(BaseModel):
@@ -83,14 +86,85 @@ class SearchResponse(BaseModel):
     new_count: int
     duplicate_count: int
     total_found: int
+    cache_status: Optional[str] = None
+    truncated: bool = False  # limitte kesilen tile var: sonuçlar eksik olabilir
     businesses: List[BusinessResponse]
 
 
+class SearchJobResponse(BaseModel):
+    """Arka plan arama işi durumu"""
+    id: str
+    status: str
+    params: dict
+    attempts: int
+    batches: int
+    found_count: int
+    new_count: int
+    duplicate_count: int
+    cache_status: Optional[str] = None
+    error: Optional[str] = None
+    next_run_at: Optional[datetime] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class BusinessFilterSpec(BaseModel):
+    """Kaydedilebilir işletme filtre tanımı"""
+    city: Optional[str] = None
+    business_type: Optional[str] = None
+    has_phone: Optional[bool] = None
+    has_website: Optional[bool] = None
+    min_rating: Optional[float] = Field(None, ge=0, le=5)
+    search: Optional[str] = None
+
+    class Config:
+        extra = "forbid"
+
+
 class ExportRequest(BaseModel):
     """Dışa aktarım isteği"""
-    format: str = Field("xlsx", pattern="^(xlsx|csv|json)$")
+    format: str = Field("xlsx", pattern="^(xlsx|csv|json|ndjson|parquet|arrow)$")
     business_ids: Optional[List[int]] = None
+    filters: Optional[BusinessFilterSpec] = None
+    selection: Optional[str] = Field(None, max_length=32, description="Seçim token'ı (/api/selections)")
+
+
+class ExportJobResponse(BaseModel):
+    """Arka plan dışa aktarım işi durumu"""
+    id: str
+    format: str
+    status: str
+    rows_processed: int
+    total_rows: int
+    progress: float
+    eta_seconds: Optional[float] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    download_url: Optional[str] = None
+
+
+# İşletme ID'leri pozitiftir (seçim ID kümeleri yalnızca pozitif tamsayıları kodlar)
+BusinessId = Annotated[int, Field(ge=1)]
+
+
+class SelectionCreate(BaseModel):
+    """Seçim oluşturma: (filtre eşleşmeleri + dahil edilenler) - hariç tutulanlar"""
+    filters: Optional[BusinessFilterSpec] = None
+    include_ids: List[BusinessId] = Field(default_factory=list)
+    exclude_ids: List[BusinessId] = Field(default_factory=list)
+
+
+class SelectionResponse(BaseModel):
+    """Seçim özeti"""
+    token: str
     filters: Optional[dict] = None
+    include_count: int
+    exclude_count: int
+    total: int
+    created_at: datetime
+    expires_at: datetime
 
 
 class StatsResponse(BaseModel):
@@ -0,0 +1,313 @@
+"""
+İşletme dışa aktarım servisi
+Satırlar veritabanından parça parça (yield_per) okunur, dosya içeriği akış olarak üretilir
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional, Sequence
+
+from sqlalchemy.sql import Select
+
+from app.core.config import EXPORT_BATCH_SIZE
+from app.core.database import ReadSessionLocal
+from app.services.business_store import RESPONSE_COLUMNS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# İlerleme bildirimi: her parçadan sonra işlenen satır sayısıyla çağrılır
+Progress = Callable[[int], None]
+
+# Dışa aktarılan kolonlar (Business.to_dict alanları, aynı sırada)
+EXPORT_COLUMNS = RESPONSE_COLUMNS
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+# Tablo formatları (CSV/Excel) için başlıklar ve karşılık gelen alanlar
+TABULAR_HEADERS = [
+    "ID", "İşletme Adı", "Adres", "Şehir", "İlçe",
+    "Telefon", "Website", "Kategori", "Puan",
+    "Değerlendirme", "Notlar", "Etiketler"
+]
+_TABULAR_INDEXES = [
+    EXPORT_FIELDS.index(field) for field in (
+        "id", "name", "address", "city", "district",
+        "phone", "website", "business_type", "rating",
+        "total_ratings", "notes", "tags"
+    )
+]
+_ID, _TOTAL_RATINGS = EXPORT_FIELDS.index("id"), EXPORT_FIELDS.index("total_ratings")
+
+# Excel sayfa başına satır sınırı (başlık dahil)
+XLSX_MAX_ROWS = 1048576
+XLSX_SHEET_TITLE = "İşletmeler"
+XLSX_COLUMN_WIDTHS = [8, 35, 45, 15, 15, 18, 35, 15, 8, 12, 30, 25]
+
+
+def tabular_values(row: Sequence) -> List:
+    """Satırı tablo formatı değerlerine çevir (boşlar "", değerlendirme 0)"""
+    values = []
+    for index in _TABULAR_INDEXES:
+        value = row[index]
+        if index == _TOTAL_RATINGS:
+            values.append(value or 0)
+        elif index == _ID:
+            values.append(value)
+        else:
+            values.append(value or "")
+    return values
+
+
+def iter_row_batches(
+    statement: Select,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    progress: Optional[Progress] = None
+) -> Iterator[List[Sequence]]:
+    """Sorguyu kendi okuma oturumunda çalıştır, satırları parça parça döndür
+
+    Akış, endpoint bağımlılıkları kapandıktan sonra sürdüğü için oturum burada açılır.
+    """
+    db = ReadSessionLocal()
+    try:
+        result = db.execute(statement.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            yield partition
+            if progress is not None:
+                progress(len(partition))
+    finally:
+        db.close()
+
+
+def csv_chunks(statement: Select, progress: Optional[Progress] = None) -> Iterator[bytes]:
+    """CSV içeriğini UTF-8 BOM ile başlayarak parça parça üret"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, quoting=csv.QUOTE_ALL)
+
+    # Excel'in UTF-8 olarak açması için BOM
+    buffer.write("\ufeff")
+    writer.writerow(TABULAR_HEADERS)
+
+    for rows in iter_row_batches(statement, progress=progress):
+        writer.writerows(tabular_values(row) for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _json_default(value):
+    """Standart json için datetime serileştirme"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Serileştirilemeyen tip: {type(value).__name__}")
+
+
+def _dumps(record: dict) -> bytes:
+    """Kaydı JSON'a çevir (orjson varsa onunla)"""
+    if orjson is not None:
+        return orjson.dumps(record)
+    return json.dumps(
+        record, ensure_ascii=False, separators=(",", ":"), default=_json_default
+    ).encode("utf-8")
+
+
+def _iter_records(statement: Select, progress: Optional[Progress] = None) -> Iterator[List[bytes]]:
+    """Satır demetlerini ORM nesnesi oluşturmadan JSON kayıtlarına çevir (parça parça)"""
+    fields = EXPORT_FIELDS
+    for rows in iter_row_batches(statement, progress=progress):
+        yield [_dumps(dict(zip(fields, row))) for row in rows]
+
+
+def json_chunks(statement: Select, progress: Optional[Progress] = None) -> Iterator[bytes]:
+    """JSON dizisini satırlar okundukça parça parça üret (her kayıt ayrı satırda)"""
+    yield b"["
+    separator = b"\n"
+    for records in _iter_records(statement, progress):
+        chunk = separator + b",\n".join(records)
+        separator = b",\n"
+        yield chunk
+    yield b"\n]" if separator != b"\n" else b"]"
+
+
+def ndjson_chunks(statement: Select, progress: Optional[Progress] = None) -> Iterator[bytes]:
+    """Satır başına bir JSON kaydı (NDJSON) üret"""
+    for records in _iter_records(statement, progress):
+        yield b"\n".join(records) + b"\n"
+
+
+def _xlsx_styles():
+    """Tüm hücrelerde paylaşılan adlandırılmış stiller (başlık, veri)"""
+    from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+
+    thin = Side(style="thin")
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+
+    header = NamedStyle(name="export_header")
+    header.font = Font(bold=True, color="FFFFFF")
+    header.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    header.alignment = Alignment(horizontal="center", vertical="center")
+    header.border = border
+
+    cell = NamedStyle(name="export_cell")
+    cell.alignment = Alignment(vertical="center")
+    cell.border = border
+    return header, cell
+
+
+def write_xlsx(
+    statement: Select,
+    path: str,
+    progress: Optional[Progress] = None,
+    max_rows: int = XLSX_MAX_ROWS
+) -> int:
+    """Excel dosyasını write-only modda diske yaz, yazılan satır sayısını döndür
+
+    Satırlar sayfa sınırını aşarsa yeni sayfaya ("İşletmeler (2)", ...) geçilir.
+    openpyxl yüklü değilse ImportError fırlatır.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    header_style, cell_style = _xlsx_styles()
+    wb.add_named_style(header_style)
+    wb.add_named_style(cell_style)
+
+    def new_sheet(number: int):
+        title = XLSX_SHEET_TITLE if number == 1 else f"{XLSX_SHEET_TITLE} ({number})"
+        ws = wb.create_sheet(title)
+        # write-only modda genişlikler satırlardan önce ayarlanmalı
+        for col, width in enumerate(XLSX_COLUMN_WIDTHS, 1):
+            ws.column_dimensions[get_column_letter(col)].width = width
+        header = []
+        for value in TABULAR_HEADERS:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = "export_header"
+            header.append(cell)
+        ws.append(header)
+        return ws
+
+    sheet_count = 1
+    ws = new_sheet(sheet_count)
+    sheet_rows = 1
+    written = 0
+
+    for rows in iter_row_batches(statement, progress=progress):
+        for row in rows:
+            if sheet_rows >= max_rows:
+                sheet_count += 1
+                ws = new_sheet(sheet_count)
+                sheet_rows = 1
+            cells = []
+            for value in tabular_values(row):
+                cell = WriteOnlyCell(ws, value=value)
+                cell.style = "export_cell"
+                cells.append(cell)
+            ws.append(cells)
+            sheet_rows += 1
+            written += 1
+
+    wb.save(path)
+    return written
+
+
+# Kolonsal formatlarda sözlük kodlanan (tekrarı yüksek) alanlar
+DICTIONARY_FIELDS = ("city", "district", "business_type")
+
+
+def _arrow_schema(pa):
+    """Dışa aktarım kolonları için Arrow şeması"""
+    types = {
+        "id": pa.int64(),
+        "rating": pa.float64(),
+        "total_ratings": pa.int64(),
+        "latitude": pa.float64(),
+        "longitude": pa.float64(),
+        "created_at": pa.timestamp("us"),
+        "updated_at": pa.timestamp("us"),
+    }
+    fields = []
+    for field in EXPORT_FIELDS:
+        if field in DICTIONARY_FIELDS:
+            fields.append(pa.field(field, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            fields.append(pa.field(field, types.get(field, pa.string())))
+    return pa.schema(fields)
+
+
+def _record_batches(statement: Select, pa, schema, progress: Optional[Progress] = None) -> Iterator:
+    """Veritabanı parçalarını doğrudan Arrow record batch'lerine çevir"""
+    for rows in iter_row_batches(statement, progress=progress):
+        columns = list(zip(*rows))
+        arrays = []
+        for field, values in zip(schema, columns):
+            if pa.types.is_dictionary(field.type):
+                arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def write_parquet(statement: Select, path: str, progress: Optional[Progress] = None) -> int:
+    """Parquet dosyasını (zstd) record batch'ler halinde yaz, satır sayısını döndür
+
+    pyarrow yüklü değilse ImportError fırlatır.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(pa)
+    written = 0
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for batch in _record_batches(statement, pa, schema, progress):
+            writer.write_batch(batch)
+            written += batch.num_rows
+    return written
+
+
+def write_arrow(statement: Select, path: str, progress: Optional[Progress] = None) -> int:
+    """Arrow IPC akış dosyasını (zstd) yaz, satır sayısını döndür
+
+    Her batch kendi sözlüğünü taşıdığı için dosya değil akış (stream) formatı kullanılır.
+    pyarrow yüklü değilse ImportError fırlatır.
+    """
+    import pyarrow as pa
+
+    schema = _arrow_schema(pa)
+    written = 0
+    options = pa.ipc.IpcWriteOptions(compression="zstd")
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_stream(sink, schema, options=options) as writer:
+        for batch in _record_batches(statement, pa, schema, progress):
+            writer.write_batch(batch)
+            written += batch.num_rows
+    return written
+
+
+def _write_chunks(chunks: Callable[..., Iterator[bytes]]):
+    """Akış üreten formatı dosyaya yazan fonksiyona çevir"""
+    def writer(statement: Select, path: str, progress: Optional[Progress] = None) -> None:
+        with open(path, "wb") as f:
+            for chunk in chunks(statement, progress=progress):
+                f.write(chunk)
+    return writer
+
+
+# format -> (dosya uzantısı, içerik tipi, dosyaya yazan fonksiyon, gerekli kütüphane)
+EXPORT_FORMATS = {
+    "xlsx": (
+        "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        write_xlsx, "openpyxl"
+    ),
+    "csv": ("csv", "text/csv; charset=utf-8", _write_chunks(csv_chunks), None),
+    "json": ("json", "application/json; charset=utf-8", _write_chunks(json_chunks), None),
+    "ndjson": ("ndjson", "application/x-ndjson", _write_chunks(ndjson_chunks), None),
+    "parquet": ("parquet", "application/vnd.apache.parquet", write_parquet, "pyarrow"),
+    "arrow": ("arrows", "application/vnd.apache.arrow.stream", write_arrow, "pyarrow"),
+}
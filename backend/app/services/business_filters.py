@@ -0,0 +1,161 @@
+"""
+İşletme filtreleri
+Liste, ID toplama ve dışa aktarım endpoint'lerinin ortak filtre mantığı
+"""
+
+import json
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, column, func, select, table, text
+from sqlalchemy.orm import aliased
+
+from app.core.id_set import IdRange, to_ranges
+from app.core.text import fold_text, search_tokens
+from app.models.business import Business
+from app.services.geo import BBox, circle_bbox
+
+# Filtre tanımlarında (dışa aktarım isteği, seçimler) kabul edilen anahtarlar
+FILTER_KEYS = ("city", "business_type", "has_phone", "has_website", "min_rating", "search")
+
+# R*Tree sanal tablosu (app.core.schema içinde oluşturulur, ORM modeli yok)
+_rtree = table(
+    "businesses_rtree",
+    column("id"), column("min_lat"), column("max_lat"), column("min_lon"), column("max_lon")
+)
+
+
+def fts_match_query(search: Optional[str]) -> Optional[str]:
+    """Arama metnini FTS5 MATCH ifadesine çevir (her kelime önek olarak, AND)"""
+    tokens = search_tokens(search)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def prefix_match(col, value: str):
+    """Normalize kolonda önek eşleşmesi (indeks kullanan aralık sorgusu)"""
+    return and_(col >= value, col < value + "\U0010ffff")
+
+
+def rtree_bbox_filter(bbox: BBox):
+    """R*Tree indeksi ile sınır kutusu içindeki işletmeler
+
+    Her çağrı kendi (anonim) parametrelerini bağlar; aynı sorguda birden fazla kutu
+    (bbox + near) birbirini ezmez.
+    """
+    south, west, north, east = bbox
+    return Business.id.in_(
+        select(_rtree.c.id).where(
+            _rtree.c.min_lat >= south,
+            _rtree.c.max_lat <= north,
+            _rtree.c.min_lon >= west,
+            _rtree.c.max_lon <= east
+        )
+    )
+
+
+def id_ranges_filter(ranges: Iterable[IdRange]):
+    """ID aralıkları filtresi
+
+    Aralıklar tek JSON parametresiyle ([[başlangıç, bitiş], ...]) gönderilir ve her biri
+    birincil anahtar üzerinde aralık taraması olur; küme hiçbir yerde tek tek ID'lere açılmaz.
+    """
+    spans = func.json_each(json.dumps([[start, end] for start, end in ranges])).table_valued("value")
+    matched = aliased(Business)
+    return Business.id.in_(
+        select(matched.id).select_from(spans).join(
+            matched,
+            matched.id.between(
+                func.json_extract(spans.c.value, "$[0]"),
+                func.json_extract(spans.c.value, "$[1]")
+            )
+        )
+    )
+
+
+def id_set_filter(ids: Iterable[int]):
+    """ID kümesi filtresi; ardışık ID'ler aralıklara birleştirilerek gönderilir"""
+    return id_ranges_filter(to_ranges(ids))
+
+
+class CompiledFilter:
+    """Derlenmiş filtre: kanonik anahtar + SQL koşulları"""
+
+    def __init__(self, key: str, conditions: List):
+        self.key = key
+        self.conditions = conditions
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.conditions
+
+    def apply(self, query):
+        """Koşulları ORM sorgusuna ya da select() ifadesine uygula"""
+        for condition in self.conditions:
+            query = query.filter(condition)
+        return query
+
+
+def compile_filters(
+    city: Optional[str] = None,
+    business_type: Optional[str] = None,
+    has_phone: Optional[bool] = None,
+    has_website: Optional[bool] = None,
+    min_rating: Optional[float] = None,
+    search: Optional[str] = None,
+    bbox: Optional[BBox] = None,
+    near: Optional[Tuple[float, float]] = None,
+    radius: Optional[float] = None
+) -> CompiledFilter:
+    """Filtre parametrelerini normalize et, kanonik anahtar ve koşullara çevir
+
+    Aynı sonucu veren yazımlar ("İSTANBUL" / "istanbul", kelime sırası hariç arama)
+    aynı anahtara düşer. `bbox` (güney, batı, kuzey, doğu) ve `near` + `radius` (metre)
+    R*Tree indeksiyle ön filtrelenir; yarıçap filtresi ardından haversine ile kesinleştirilir.
+    """
+    spec = {}
+    conditions = []
+
+    # Şehir/kategori: normalize kolonlarda önek eşleşmesi (indeks araması)
+    city_norm = fold_text(city)
+    if city_norm:
+        spec["city"] = city_norm
+        conditions.append(prefix_match(Business.city_norm, city_norm))
+    business_type_norm = fold_text(business_type)
+    if business_type_norm:
+        spec["business_type"] = business_type_norm
+        conditions.append(prefix_match(Business.business_type_norm, business_type_norm))
+    if has_phone:
+        spec["has_phone"] = True
+        conditions.append(and_(Business.phone.isnot(None), Business.phone != ""))
+    if has_website:
+        spec["has_website"] = True
+        conditions.append(and_(Business.website.isnot(None), Business.website != ""))
+    if min_rating:
+        spec["min_rating"] = float(min_rating)
+        conditions.append(Business.rating >= min_rating)
+    match = fts_match_query(search) if search else None
+    if match:
+        spec["search"] = sorted(set(search_tokens(search)))
+        # İsim/adres araması FTS5 indeksi üzerinden (tam tablo taraması yok)
+        conditions.append(Business.id.in_(
+            text("SELECT rowid FROM businesses_fts WHERE businesses_fts MATCH :fts_query")
+            .bindparams(fts_query=match)
+            .columns(column("rowid"))
+        ))
+    if bbox:
+        spec["bbox"] = list(bbox)
+        conditions.append(rtree_bbox_filter(bbox))
+    if near and radius:
+        lat, lon = near
+        spec["near"] = [lat, lon, radius]
+        conditions.append(rtree_bbox_filter(circle_bbox(lat, lon, radius)))
+        conditions.append(func.haversine_m(Business.latitude, Business.longitude, lat, lon) <= radius)
+
+    key = json.dumps(spec, sort_keys=True, ensure_ascii=False)
+    return CompiledFilter(key, conditions)
+
+
+def apply_business_filters(query, **params):
+    """Sorguya standart işletme filtrelerini uygula (bkz. compile_filters)"""
+    return compile_filters(**params).apply(query)
@@ -0,0 +1,108 @@
+"""
+İşletme kayıt servisi
+Arama sonuçlarını toplu (set bazlı) olarak veritabanına yazar
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.business import Business
+
+# SQLite parametre limitinin altında kalacak IN (...) parça boyutu
+LOOKUP_CHUNK_SIZE = 500
+
+# Yanıtta kullanılan kolonlar (BusinessResponse alanları)
+RESPONSE_COLUMNS = [
+    Business.id, Business.place_id, Business.name, Business.address,
+    Business.city, Business.district, Business.phone, Business.website,
+    Business.rating, Business.total_ratings, Business.business_type,
+    Business.latitude, Business.longitude, Business.notes, Business.tags,
+    Business.created_at, Business.updated_at
+]
+
+
+def _find_existing(db: Session, place_ids: List[str]) -> Dict[str, Dict]:
+    """Var olan kayıtları parça parça tek sorguda bul (place_id -> satır)"""
+    existing = {}
+    for i in range(0, len(place_ids), LOOKUP_CHUNK_SIZE):
+        chunk = place_ids[i:i + LOOKUP_CHUNK_SIZE]
+        rows = db.execute(
+            select(*RESPONSE_COLUMNS).where(Business.place_id.in_(chunk))
+        ).mappings()
+        for row in rows:
+            existing[row["place_id"]] = dict(row)
+    return existing
+
+
+def bulk_ingest(
+    db: Session,
+    businesses: List[Dict],
+    user_id: Optional[int] = None,
+    response_limit: int = 100
+) -> Tuple[int, int, List[Dict]]:
+    """Arama sonuçlarını toplu kaydet
+
+    Döndürür: (yeni sayısı, mükerrer sayısı, yanıt için ilk `response_limit` kayıt)
+    Yeni satırlar tekrar okunmaz; yanıt, yazılan değerler + dönen id'lerden kurulur.
+    """
+    if not businesses:
+        return 0, 0, []
+
+    existing = _find_existing(db, [b["place_id"] for b in businesses])
+
+    now = datetime.utcnow()
+    new_rows = []
+    for data in businesses:
+        if data["place_id"] in existing:
+            continue
+        new_rows.append({
+            "place_id": data["place_id"],
+            "name": data["name"],
+            "address": data.get("address"),
+            "city": data.get("city"),
+            "district": data.get("district"),
+            "phone": data.get("phone"),
+            "website": data.get("website"),
+            "rating": data.get("rating"),
+            "total_ratings": data.get("total_ratings", 0),
+            "business_type": data["business_type"],
+            "latitude": data.get("latitude"),
+            "longitude": data.get("longitude"),
+            "notes": None,
+            "tags": None,
+            "user_id": user_id,
+            "created_at": now,
+            "updated_at": now
+        })
+
+    inserted = {}
+    if new_rows:
+        # Eşzamanlı bir arama aynı place_id'yi yazmışsa satır sessizce atlanır
+        stmt = sqlite_insert(Business).on_conflict_do_nothing(
+            index_elements=["place_id"]
+        ).returning(Business.id, Business.place_id, sort_by_parameter_order=True)
+        for business_id, place_id in db.execute(stmt, new_rows):
+            inserted[place_id] = business_id
+    db.commit()
+
+    new_count = len(inserted)
+    duplicate_count = len(businesses) - new_count
+
+    new_by_place_id = {row["place_id"]: row for row in new_rows}
+    response = []
+    for data in businesses:
+        if len(response) >= response_limit:
+            break
+        place_id = data["place_id"]
+        if place_id in inserted:
+            row = new_by_place_id[place_id]
+            row["id"] = inserted[place_id]
+            response.append(row)
+        elif place_id in existing:
+            response.append(existing[place_id])
+
+    return new_count, duplicate_count, response
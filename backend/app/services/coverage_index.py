@@ -0,0 +1,220 @@
+"""
+Arama kapsama indeksi
+Upstream'den eksiksiz çekilmiş (filtre seti, alan, zaman) kayıtları;
+taze ve tamamen kapsanan istekler yerel veritabanından yanıtlanır
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+from app.core.config import COVERAGE_MAX_AGE_HOURS, COVERAGE_RETENTION_DAYS
+from app.core.database import ReadSessionLocal, run_write
+from app.models.coverage import SearchCoverage
+from app.services.business_store import _find_existing
+from app.services.geo import area_bbox, area_contains, point_in_area
+
+logger = logging.getLogger(__name__)
+
+
+class CoverageIndexService:
+    """Filtre seti başına kapsanan alanları tutan indeks"""
+
+    def __init__(self, max_age: timedelta, retention: timedelta):
+        self.max_age = max_age
+        self.retention = retention
+
+    @staticmethod
+    def make_key(filters: Sequence[str]) -> str:
+        """Sıralı filtre seti -> sabit uzunlukta anahtar (alan ve limitten bağımsız)"""
+        canonical = json.dumps(sorted(filters), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _members(entry: SearchCoverage) -> List[List]:
+        """Kayıttaki [place_id, lat, lon] listesini aç"""
+        return json.loads(zlib.decompress(entry.members))
+
+    def _candidates(
+        self,
+        key: str,
+        area: dict,
+        max_age: timedelta,
+        tile_ids: Optional[List[str]] = None
+    ) -> List[SearchCoverage]:
+        """Taze ve sınır kutusu isteği içine alan kayıtlar (thread içinde)"""
+        db = ReadSessionLocal()
+        try:
+            query = db.query(SearchCoverage).filter(
+                SearchCoverage.query_key == key,
+                SearchCoverage.fetched_at >= datetime.utcnow() - max_age
+            )
+            if tile_ids is not None:
+                query = query.filter(SearchCoverage.tile_id.in_(tile_ids))
+            else:
+                south, west, north, east = area_bbox(area)
+                query = query.filter(
+                    SearchCoverage.min_lat <= south,
+                    SearchCoverage.max_lat >= north,
+                    SearchCoverage.min_lon <= west,
+                    SearchCoverage.max_lon >= east
+                )
+            return query.order_by(SearchCoverage.fetched_at.desc()).all()
+        finally:
+            db.close()
+
+    def _load_rows(self, place_ids: List[str]) -> Dict[str, Dict]:
+        """Yerel işletme satırlarını oku (thread içinde, okuma havuzundan)"""
+        db = ReadSessionLocal()
+        try:
+            return _find_existing(db, place_ids)
+        finally:
+            db.close()
+
+    def _resolve(self, members: List[List], area: dict) -> Optional[List[Dict]]:
+        """Alan içindeki üyeleri yerelden getir; eksik satır varsa None (kapsama geçersiz)"""
+        place_ids = [m[0] for m in members if point_in_area(m[1], m[2], area)]
+        rows = self._load_rows(place_ids) if place_ids else {}
+        if len(rows) < len(place_ids):
+            return None
+        return [rows[place_id] for place_id in place_ids]
+
+    def _lookup(self, key: str, area: dict, max_age: timedelta) -> Optional[List[Dict]]:
+        for entry in self._candidates(key, area, max_age):
+            if not area_contains(json.loads(entry.geometry), area):
+                continue
+            rows = self._resolve(self._members(entry), area)
+            if rows is not None:
+                return rows
+        return None
+
+    def _lookup_tiles(
+        self,
+        key: str,
+        tile_ids: List[str],
+        area: dict,
+        max_age: timedelta
+    ) -> Dict[str, List[Dict]]:
+        covered = {}
+        for entry in self._candidates(key, area, max_age, tile_ids=tile_ids):
+            if entry.tile_id in covered:
+                continue
+            rows = self._resolve(self._members(entry), area)
+            if rows is not None:
+                covered[entry.tile_id] = rows
+        return covered
+
+    async def lookup(
+        self,
+        key: str,
+        area: dict,
+        max_age: Optional[timedelta] = None
+    ) -> Optional[List[Dict]]:
+        """Alanı tamamen kapsayan taze kayıt varsa yerel satırları döndür (yoksa None)"""
+        max_age = self.max_age if max_age is None else max_age
+        if max_age <= timedelta(0):
+            return None
+        try:
+            return await asyncio.to_thread(self._lookup, key, area, max_age)
+        except Exception as e:
+            logger.error(f"Kapsama indeksi okuma hatası: {e}")
+            return None
+
+    async def lookup_tiles(
+        self,
+        key: str,
+        tile_ids: List[str],
+        area: dict,
+        max_age: Optional[timedelta] = None
+    ) -> Dict[str, List[Dict]]:
+        """Taze kapsanan tile'lar için alana kırpılmış yerel satırlar (tile_id -> satırlar)"""
+        max_age = self.max_age if max_age is None else max_age
+        if max_age <= timedelta(0) or not tile_ids:
+            return {}
+        try:
+            return await asyncio.to_thread(self._lookup_tiles, key, tile_ids, area, max_age)
+        except Exception as e:
+            logger.error(f"Kapsama indeksi okuma hatası: {e}")
+            return {}
+
+    def _store(
+        self,
+        db,
+        key: str,
+        description: str,
+        area: dict,
+        geometry: str,
+        members: bytes,
+        member_count: int,
+        tile_id: Optional[str],
+        fetched_at: datetime
+    ):
+        """Aynı alanın eski kaydını değiştir, saklama süresini aşanları sil (yazıcı kuyruğunda)"""
+        now = datetime.utcnow()
+        same_area = db.query(SearchCoverage).filter(SearchCoverage.query_key == key)
+        if tile_id is not None:
+            same_area = same_area.filter(SearchCoverage.tile_id == tile_id)
+        else:
+            same_area = same_area.filter(SearchCoverage.geometry == geometry)
+        # Daha taze bir kayıt varsa eski (önbellekten gelen) veriyle ezilmez
+        if same_area.filter(SearchCoverage.fetched_at > fetched_at).first() is not None:
+            return
+        same_area.delete(synchronize_session=False)
+        db.query(SearchCoverage).filter(
+            SearchCoverage.fetched_at < now - self.retention
+        ).delete(synchronize_session=False)
+
+        south, west, north, east = area_bbox(area)
+        db.add(SearchCoverage(
+            query_key=key,
+            description=description,
+            area_type=area["type"],
+            tile_id=tile_id,
+            min_lat=south,
+            max_lat=north,
+            min_lon=west,
+            max_lon=east,
+            geometry=geometry,
+            members=members,
+            member_count=member_count,
+            fetched_at=fetched_at
+        ))
+        db.commit()
+
+    async def record(
+        self,
+        key: str,
+        description: str,
+        area: dict,
+        businesses: List[Dict],
+        fetched_at: datetime,
+        tile_id: Optional[str] = None
+    ):
+        """Eksiksiz tamamlanmış bir upstream sorgusunun alanını ve sonuçlarını kaydet
+
+        `fetched_at` verinin upstream'den alındığı zamandır (Overpass önbelleğinden gelen
+        yanıtlar için önbellek kaydının zamanı); tazelik bu zamana göre hesaplanır.
+        """
+        try:
+            members = [[b["place_id"], b["latitude"], b["longitude"]] for b in businesses]
+            payload = await asyncio.to_thread(
+                lambda: zlib.compress(json.dumps(members, separators=(",", ":")).encode("utf-8"))
+            )
+            geometry = json.dumps(area, sort_keys=True)
+            await run_write(
+                self._store, key, description, area, geometry, payload, len(members), tile_id,
+                fetched_at
+            )
+        except Exception as e:
+            logger.error(f"Kapsama indeksi yazma hatası: {e}")
+
+
+# Singleton instance
+coverage_index = CoverageIndexService(
+    max_age=timedelta(hours=COVERAGE_MAX_AGE_HOURS),
+    retention=timedelta(days=COVERAGE_RETENTION_DAYS)
+)
@@ -0,0 +1,179 @@
+"""
+Arka plan dışa aktarım işleri
+İş havuzu dosyayı diske yazar; ilerleme, tahmini süre ve süre dolunca temizlik
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy.sql import Select
+
+from app.core.config import EXPORT_JOB_DIR, EXPORT_JOB_WORKERS, EXPORT_JOB_TTL_MINUTES
+from app.services.business_export import EXPORT_FORMATS
+
+logger = logging.getLogger(__name__)
+
+# Bu servisin yazdığı dosyalar: export_<iş id>.<uzantı>
+FILE_PREFIX = "export_"
+_FILE_RE = re.compile(rf"^{FILE_PREFIX}[0-9a-f]{{32}}\.[a-z]+$")
+
+
+class ExportJob:
+    """Tek bir dışa aktarım işinin durumu"""
+
+    def __init__(self, job_id: str, format: str, total_rows: int):
+        self.id = job_id
+        self.format = format
+        self.total_rows = total_rows
+        self.rows_processed = 0
+        self.status = "queued"  # queued, running, done, failed
+        self.error: Optional[str] = None
+        self.path: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """İşleme hızına göre kalan süre tahmini"""
+        if self.status != "running" or not self.rows_processed or not self.started_at:
+            return None
+        elapsed = (datetime.utcnow() - self.started_at).total_seconds()
+        remaining = max(self.total_rows - self.rows_processed, 0)
+        return round(remaining * elapsed / self.rows_processed, 1)
+
+    def to_dict(self) -> Dict:
+        """Durum yanıtı"""
+        return {
+            "id": self.id,
+            "format": self.format,
+            "status": self.status,
+            "rows_processed": self.rows_processed,
+            "total_rows": self.total_rows,
+            "progress": round(self.rows_processed / self.total_rows, 4) if self.total_rows else 1.0,
+            "eta_seconds": self.eta_seconds,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class ExportJobService:
+    """Dışa aktarım işlerini iş parçacığı havuzunda çalıştıran servis"""
+
+    def __init__(self, directory: str, workers: int, ttl: timedelta):
+        self.directory = directory
+        self.workers = workers
+        self.ttl = ttl
+        self._jobs: Dict[str, ExportJob] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def startup(self):
+        """Dizini hazırla, önceki çalıştırmalardan kalan süresi dolmuş dosyaları sil (uygulama başlangıcında)"""
+        os.makedirs(self.directory, exist_ok=True)
+        self._remove_stale_files()
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="export")
+
+    def shutdown(self):
+        """Bekleyen işleri iptal et (uygulama kapanışında)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            # lifespan dışında (ör. script) kullanım için tembel oluşturma
+            os.makedirs(self.directory, exist_ok=True)
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="export")
+        return self._executor
+
+    def submit(self, format: str, statement: Select, total_rows: int) -> ExportJob:
+        """Yeni iş oluştur ve kuyruğa al"""
+        self.cleanup()
+        job = ExportJob(uuid.uuid4().hex, format, total_rows)
+        with self._lock:
+            self._jobs[job.id] = job
+        self.executor.submit(self._run, job, statement)
+        return job
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        """İşi getir (süresi dolmuşsa None)"""
+        self.cleanup()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: ExportJob, statement: Select):
+        """Dosyayı diske yaz (havuz iş parçacığında)"""
+        extension, _, writer, _ = EXPORT_FORMATS[job.format]
+        path = os.path.join(self.directory, f"{FILE_PREFIX}{job.id}.{extension}")
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+
+        def progress(rows: int):
+            job.rows_processed += rows
+
+        try:
+            writer(statement, path, progress=progress)
+        except Exception as e:
+            logger.error(f"Dışa aktarım işi {job.id} başarısız: {e}")
+            if os.path.exists(path):
+                os.remove(path)
+            job.error = "Gerekli kütüphane yüklü değil" if isinstance(e, ImportError) else str(e)
+            job.status = "failed"
+        else:
+            job.path = path
+            job.status = "done"
+        job.finished_at = datetime.utcnow()
+
+    def _remove_stale_files(self):
+        """Yalnızca bu servisin adlandırdığı ve TTL'i aşmış dosyaları sil
+
+        Dizin paylaşılabilir (ortam değişkeniyle ayarlanır, birden fazla worker süreci):
+        başka dosyalara ve diğer süreçlerin henüz süresi dolmamış çıktılarına dokunulmaz.
+        """
+        cutoff = time.time() - self.ttl.total_seconds()
+        removed = 0
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or not _FILE_RE.match(entry.name):
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        if removed:
+            logger.info(f"Önceki çalıştırmalardan kalan {removed} dışa aktarım dosyası silindi")
+
+    def cleanup(self):
+        """Bitişinden bu yana süresi dolan işleri ve dosyalarını sil"""
+        cutoff = datetime.utcnow() - self.ttl
+        with self._lock:
+            expired = [
+                job for job in self._jobs.values()
+                if job.finished_at is not None and job.finished_at < cutoff
+            ]
+            for job in expired:
+                del self._jobs[job.id]
+        for job in expired:
+            if job.path and os.path.exists(job.path):
+                os.remove(job.path)
+        if expired:
+            logger.info(f"{len(expired)} süresi dolmuş dışa aktarım işi silindi")
+
+
+# Singleton instance
+export_jobs = ExportJobService(
+    directory=EXPORT_JOB_DIR,
+    workers=EXPORT_JOB_WORKERS,
+    ttl=timedelta(minutes=EXPORT_JOB_TTL_MINUTES)
+)
@@ -0,0 +1,75 @@
+"""
+Filtre sonuç kümesi önbelleği
+Derlenmiş filtrenin eşleşen ID'leri (liste sırasıyla) ve sayısı veri sürümü ile etiketlenip
+saklanır. ID toplama ve dışa aktarım diziyi oluşturur; liste sayfaları dizi önbellekteyse ondan
+dilimler, değilse LIMIT/OFFSET kullanır (tek sayfa için dizi oluşturulmaz). Toplamlar sayı
+önbelleğinden gelir.
+"""
+
+from array import array
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import VersionedLRUCache
+from app.core.config import FILTER_CACHE_MAX_ENTRIES, FILTER_CACHE_MAX_IDS, FILTER_COUNT_CACHE_MAX_ENTRIES
+from app.models.business import Business
+from app.models.stats import DataVersion
+from app.services.business_filters import CompiledFilter
+
+# Liste sırası (en yeni önce)
+LIST_ORDER = (Business.created_at.desc(), Business.id.desc())
+
+
+class FilterResultService:
+    """Filtre anahtarı -> sıralı ID dizisi ve eşleşen kayıt sayısı (sürüm değişince geçersiz)"""
+
+    def __init__(self, max_entries: int, max_ids: int, max_counts: int):
+        self._cache = VersionedLRUCache(max_entries=max_entries, max_weight=max_ids)
+        self._counts = VersionedLRUCache(max_entries=max_counts, max_weight=max_counts)
+
+    @staticmethod
+    def current_version(db: Session) -> int:
+        """Tetikleyicilerin artırdığı veri sürümü"""
+        return db.query(DataVersion.version).filter(DataVersion.id == 1).scalar() or 0
+
+    def peek(self, db: Session, compiled: CompiledFilter) -> Optional[array]:
+        """Önbellekte güncel sonuç varsa döndür (hesaplamaz)"""
+        return self._cache.get(compiled.key, self.current_version(db))
+
+    def ids(self, db: Session, compiled: CompiledFilter) -> array:
+        """Eşleşen ID'ler, liste sırasıyla (önbellekte yoksa bir kez hesaplanır)"""
+        # Sürüm sonuçtan önce okunur: araya giren yazım en kötü ihtimalle
+        # eski sürüm etiketiyle daha yeni bir küme bırakır, tersi olmaz
+        version = self.current_version(db)
+        ids = self._cache.get(compiled.key, version)
+        if ids is None:
+            statement = compiled.apply(select(Business.id)).order_by(*LIST_ORDER)
+            ids = array("q", db.execute(statement).scalars())
+            self._cache.set(compiled.key, version, ids, weight=max(len(ids), 1))
+        return ids
+
+    def count(self, db: Session, compiled: CompiledFilter) -> int:
+        """Eşleşen kayıt sayısı (ID dizisi önbellekteyse onun uzunluğu, yoksa sürüm başına bir COUNT)"""
+        version = self.current_version(db)
+        ids = self._cache.get(compiled.key, version)
+        if ids is not None:
+            return len(ids)
+        total = self._counts.get(compiled.key, version)
+        if total is None:
+            total = db.execute(compiled.apply(select(func.count(Business.id)))).scalar()
+            self._counts.set(compiled.key, version, total)
+        return total
+
+    def clear(self):
+        self._cache.clear()
+        self._counts.clear()
+
+
+# Singleton instance
+filter_results = FilterResultService(
+    max_entries=FILTER_CACHE_MAX_ENTRIES,
+    max_ids=FILTER_CACHE_MAX_IDS,
+    max_counts=FILTER_COUNT_CACHE_MAX_ENTRIES
+)
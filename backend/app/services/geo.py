@@ -0,0 +1,217 @@
+"""
+Coğrafi yardımcılar
+Mesafe, polygon içi kontrol ve sabit derece ızgarasına (tile) bölme
+"""
+
+import math
+from typing import List, Optional, Tuple
+
+EARTH_RADIUS_M = 6371000.0
+
+# (güney, batı, kuzey, doğu)
+BBox = Tuple[float, float, float, float]
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """İki nokta arasındaki büyük daire mesafesi (metre)"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def point_in_polygon(lat: float, lon: float, polygon: List[List[float]]) -> bool:
+    """Ray casting ile noktanın polygon içinde olup olmadığı ([[lat, lng], ...])"""
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        lat_i, lon_i = polygon[i][0], polygon[i][1]
+        lat_j, lon_j = polygon[j][0], polygon[j][1]
+        if (lat_i > lat) != (lat_j > lat):
+            cross_lon = lon_i + (lat - lat_i) * (lon_j - lon_i) / (lat_j - lat_i)
+            if lon < cross_lon:
+                inside = not inside
+        j = i
+    return inside
+
+
+def circle_bbox(lat: float, lon: float, radius_m: float) -> BBox:
+    """Daireyi içine alan sınır kutusu"""
+    d_lat = math.degrees(radius_m / EARTH_RADIUS_M)
+    cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+    d_lon = math.degrees(radius_m / (EARTH_RADIUS_M * cos_lat))
+    return lat - d_lat, lon - d_lon, lat + d_lat, lon + d_lon
+
+
+def polygon_bbox(polygon: List[List[float]]) -> BBox:
+    """Polygonu içine alan sınır kutusu"""
+    lats = [p[0] for p in polygon]
+    lons = [p[1] for p in polygon]
+    return min(lats), min(lons), max(lats), max(lons)
+
+
+def tile_bbox(ix: int, iy: int, size_deg: float) -> BBox:
+    """Izgara indisinden tile sınırları (sabit dereceli, global hizalı)"""
+    south = round(iy * size_deg, 6)
+    west = round(ix * size_deg, 6)
+    return south, west, round(south + size_deg, 6), round(west + size_deg, 6)
+
+
+def tiles_for_bbox(bbox: BBox, size_deg: float) -> List[Tuple[int, int]]:
+    """Sınır kutusuyla kesişen tüm ızgara hücreleri"""
+    south, west, north, east = bbox
+    iy_min, iy_max = math.floor(south / size_deg), math.floor(north / size_deg)
+    ix_min, ix_max = math.floor(west / size_deg), math.floor(east / size_deg)
+    return [
+        (ix, iy)
+        for iy in range(iy_min, iy_max + 1)
+        for ix in range(ix_min, ix_max + 1)
+    ]
+
+
+def bbox_intersects_circle(bbox: BBox, lat: float, lon: float, radius_m: float) -> bool:
+    """Kutunun daireye en yakın noktası yarıçap içinde mi"""
+    south, west, north, east = bbox
+    nearest_lat = min(max(lat, south), north)
+    nearest_lon = min(max(lon, west), east)
+    return haversine_m(lat, lon, nearest_lat, nearest_lon) <= radius_m
+
+
+def _segments_intersect(p1, p2, q1, q2) -> bool:
+    """İki doğru parçası kesişiyor mu"""
+    def orient(a, b, c):
+        return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+    d1, d2 = orient(q1, q2, p1), orient(q1, q2, p2)
+    d3, d4 = orient(p1, p2, q1), orient(p1, p2, q2)
+    return (d1 > 0) != (d2 > 0) and (d3 > 0) != (d4 > 0)
+
+
+def bbox_intersects_polygon(bbox: BBox, polygon: List[List[float]]) -> bool:
+    """Kutu ile polygon kesişiyor mu (köşe içeride, kenar kesişimi)"""
+    south, west, north, east = bbox
+    p_south, p_west, p_north, p_east = polygon_bbox(polygon)
+    if p_north < south or p_south > north or p_east < west or p_west > east:
+        return False
+
+    corners = [(south, west), (south, east), (north, east), (north, west)]
+    if any(point_in_polygon(lat, lon, polygon) for lat, lon in corners):
+        return True
+    if any(south <= p[0] <= north and west <= p[1] <= east for p in polygon):
+        return True
+
+    edges = list(zip(corners, corners[1:] + corners[:1]))
+    for i in range(len(polygon)):
+        a = tuple(polygon[i][:2])
+        b = tuple(polygon[(i + 1) % len(polygon)][:2])
+        if any(_segments_intersect(a, b, c1, c2) for c1, c2 in edges):
+            return True
+    return False
+
+
+def area_tiles(
+    size_deg: float,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    radius_m: Optional[float] = None,
+    polygon: Optional[List[List[float]]] = None
+) -> List[Tuple[int, int]]:
+    """Daire veya polygonla kesişen ızgara hücreleri"""
+    if polygon and len(polygon) >= 3:
+        return [
+            tile for tile in tiles_for_bbox(polygon_bbox(polygon), size_deg)
+            if bbox_intersects_polygon(tile_bbox(*tile, size_deg), polygon)
+        ]
+    return [
+        tile for tile in tiles_for_bbox(circle_bbox(latitude, longitude, radius_m), size_deg)
+        if bbox_intersects_circle(tile_bbox(*tile, size_deg), latitude, longitude, radius_m)
+    ]
+
+
+# Alan gösterimi (kapsama indeksi için):
+#   {"type": "circle", "lat": .., "lon": .., "radius": ..}
+#   {"type": "polygon", "points": [[lat, lng], ...]}
+#   {"type": "tile", "bbox": [güney, batı, kuzey, doğu]}
+
+def make_area(
+    latitude: float,
+    longitude: float,
+    radius_m: float,
+    polygon: Optional[List[List[float]]] = None
+) -> dict:
+    """Arama parametrelerinden alan sözlüğü oluştur"""
+    if polygon and len(polygon) >= 3:
+        return {"type": "polygon", "points": [[p[0], p[1]] for p in polygon]}
+    return {"type": "circle", "lat": latitude, "lon": longitude, "radius": radius_m}
+
+
+def area_bbox(area: dict) -> BBox:
+    """Alanın sınır kutusu"""
+    if area["type"] == "circle":
+        return circle_bbox(area["lat"], area["lon"], area["radius"])
+    if area["type"] == "polygon":
+        return polygon_bbox(area["points"])
+    return tuple(area["bbox"])
+
+
+def bbox_intersects_area(bbox: BBox, area: dict) -> bool:
+    """Kutu alanla kesişiyor mu"""
+    if area["type"] == "circle":
+        return bbox_intersects_circle(bbox, area["lat"], area["lon"], area["radius"])
+    if area["type"] == "polygon":
+        return bbox_intersects_polygon(bbox, area["points"])
+    south, west, north, east = area["bbox"]
+    return bbox[0] <= north and bbox[2] >= south and bbox[1] <= east and bbox[3] >= west
+
+
+def point_in_area(lat: float, lon: float, area: dict) -> bool:
+    """Nokta alanın içinde mi"""
+    if area["type"] == "circle":
+        return haversine_m(area["lat"], area["lon"], lat, lon) <= area["radius"]
+    if area["type"] == "polygon":
+        return point_in_polygon(lat, lon, area["points"])
+    south, west, north, east = area["bbox"]
+    return south <= lat <= north and west <= lon <= east
+
+
+def _boundary_points(area: dict, samples: int = 32) -> List[Tuple[float, float]]:
+    """Alan sınırını temsil eden noktalar (daire için örnekleme)"""
+    if area["type"] == "circle":
+        lat, lon, radius = area["lat"], area["lon"], area["radius"]
+        d_lat = math.degrees(radius / EARTH_RADIUS_M)
+        d_lon = math.degrees(radius / (EARTH_RADIUS_M * max(math.cos(math.radians(lat)), 1e-6)))
+        return [
+            (lat + d_lat * math.sin(2 * math.pi * i / samples),
+             lon + d_lon * math.cos(2 * math.pi * i / samples))
+            for i in range(samples)
+        ]
+    if area["type"] == "polygon":
+        return [(p[0], p[1]) for p in area["points"]]
+    south, west, north, east = area["bbox"]
+    return [(south, west), (south, east), (north, east), (north, west)]
+
+
+def area_contains(outer: dict, inner: dict) -> bool:
+    """`inner` alanı tamamen `outer` alanının içinde mi
+
+    Daire dış alan için kesin; polygon dış alan için sınır noktaları örneklenir.
+    """
+    if outer["type"] == "circle" and inner["type"] == "circle":
+        distance = haversine_m(outer["lat"], outer["lon"], inner["lat"], inner["lon"])
+        return distance + inner["radius"] <= outer["radius"]
+
+    points = _boundary_points(inner)
+    if not all(point_in_area(lat, lon, outer) for lat, lon in points):
+        return False
+    if outer["type"] == "polygon" and inner["type"] != "circle":
+        # İçbükey dış polygonlarda kenarların kesişmemesi de gerekir
+        outer_points = outer["points"]
+        for i in range(len(points)):
+            a, b = points[i], points[(i + 1) % len(points)]
+            for j in range(len(outer_points)):
+                c = tuple(outer_points[j][:2])
+                d = tuple(outer_points[(j + 1) % len(outer_points)][:2])
+                if _segments_intersect(a, b, c, d):
+                    return False
+    return True
@@ -0,0 +1,148 @@
+"""
+Geocode önbelleği
+Bellek içi LRU + SQLite tablosu (TTL), eşzamanlı aynı isteklerin birleştirilmesi
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import GEOCODE_CACHE_MAX_ENTRIES, GEOCODE_CACHE_TTL_DAYS
+from app.core.database import ReadSessionLocal, run_write
+from app.core.text import normalize_key
+from app.models.cache import GeocodeCache
+
+logger = logging.getLogger(__name__)
+
+Coordinates = Tuple[float, float]
+
+
+class GeocodeCacheService:
+    """İki katmanlı geocode önbelleği"""
+
+    def __init__(self, max_entries: int, ttl: timedelta):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (koordinat, geçerlilik sonu)
+        self._memory: "OrderedDict[str, Tuple[Coordinates, datetime]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _get_memory(self, key: str) -> Optional[Coordinates]:
+        """Bellek katmanından oku (LRU sırasını güncelle)"""
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        coords, expires_at = entry
+        if expires_at <= datetime.utcnow():
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return coords
+
+    def _set_memory(self, key: str, coords: Coordinates, created_at: datetime):
+        """Bellek katmanına yaz, kapasite aşılırsa en eskiyi at"""
+        self._memory[key] = (coords, created_at + self.ttl)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[Tuple[Coordinates, datetime]]:
+        """SQLite katmanından oku (thread içinde, okuma havuzundan)"""
+        db = ReadSessionLocal()
+        try:
+            row = db.query(GeocodeCache).filter(
+                GeocodeCache.key == key,
+                GeocodeCache.created_at >= datetime.utcnow() - self.ttl
+            ).first()
+            if row:
+                return (row.latitude, row.longitude), row.created_at
+            return None
+        finally:
+            db.close()
+
+    def _store(self, db, key: str, query: str, coords: Coordinates, created_at: datetime):
+        """SQLite katmanına yaz (yazıcı kuyruğunda çalışır)"""
+        db.merge(GeocodeCache(
+            key=key,
+            query=query,
+            latitude=coords[0],
+            longitude=coords[1],
+            created_at=created_at
+        ))
+        db.commit()
+
+    async def get_or_fetch(
+        self,
+        location: str,
+        fetch: Callable[[str], Awaitable[Optional[Coordinates]]]
+    ) -> Optional[Coordinates]:
+        """Önbellekten döndür, yoksa tek bir upstream isteği ile getir"""
+        key = normalize_key(location)
+        if not key:
+            return None
+
+        coords = self._get_memory(key)
+        if coords is not None:
+            return coords
+
+        # Aynı anahtar için devam eden istek varsa onun sonucunu bekle
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            coords = await self._resolve(key, location, fetch)
+            future.set_result(coords)
+            return coords
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Bekleyen yoksa "exception never retrieved" uyarısını engelle
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _resolve(
+        self,
+        key: str,
+        location: str,
+        fetch: Callable[[str], Awaitable[Optional[Coordinates]]]
+    ) -> Optional[Coordinates]:
+        """SQLite katmanını dene, yoksa upstream'den getirip iki katmana yaz"""
+        try:
+            stored = await asyncio.to_thread(self._load, key)
+        except Exception as e:
+            logger.error(f"Geocode önbellek okuma hatası: {e}")
+            stored = None
+
+        if stored is not None:
+            coords, created_at = stored
+            self._set_memory(key, coords, created_at)
+            logger.info(f"Geocode önbellek isabeti: '{key}'")
+            return coords
+
+        coords = await fetch(location)
+        if coords is None:
+            return None
+
+        now = datetime.utcnow()
+        self._set_memory(key, coords, now)
+        try:
+            await run_write(self._store, key, location, coords, now)
+        except Exception as e:
+            logger.error(f"Geocode önbellek yazma hatası: {e}")
+        return coords
+
+
+# Singleton instance
+geocode_cache = GeocodeCacheService(
+    max_entries=GEOCODE_CACHE_MAX_ENTRIES,
+    ttl=timedelta(days=GEOCODE_CACHE_TTL_DAYS)
+)
@@ -5,13 +5,56 @@ OpenStreetMap / Nominatim API servisi
 
 import httpx
 import asyncio
-from typing import List, Dict, Optional, Tuple
+from collections import deque
+from typing import Awaitable, Callable, List, Dict, Optional, Tuple
 import logging
 import re
+from datetime import datetime, timedelta
+
+from app.core.config import (
+    OSM_HTTP_MAX_CONNECTIONS,
+    OSM_HTTP_MAX_KEEPALIVE,
+    OSM_HTTP_KEEPALIVE_EXPIRY,
+    OSM_HTTP_TIMEOUT,
+    OSM_HTTP2,
+    NOMINATIM_RATE_PER_SECOND,
+    OVERPASS_CACHE_PRECISION,
+    OVERPASS_MAX_CONCURRENT,
+    OVERPASS_TILE_SIZE_DEG,
+    OVERPASS_TILE_THRESHOLD_M,
+    OVERPASS_TILE_MAX_ELEMENTS,
+    OVERPASS_TILE_MAX_SPLITS
+)
+from app.services.coverage_index import coverage_index
+from app.services.geo import (
+    area_bbox,
+    area_tiles,
+    bbox_intersects_area,
+    haversine_m,
+    make_area,
+    point_in_area,
+    polygon_bbox,
+    tile_bbox
+)
+from app.services.geocode_cache import geocode_cache
+from app.services.overpass_cache import overpass_cache
+from app.services.overpass_scheduler import PRIORITY_INTERACTIVE, UpstreamOverloaded, overpass_scheduler
+from app.services.rate_limiter import AsyncRateLimiter
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Paylaşılan Nominatim hız sınırlayıcısı (Overpass erişimi overpass_scheduler üzerinden)
+nominatim_limiter = AsyncRateLimiter(rate=NOMINATIM_RATE_PER_SECOND, burst=1, max_concurrent=1)
+
+
+class GeocodeUnavailable(Exception):
+    """Nominatim'e ulaşılamadı ya da geçersiz yanıt döndü (geçici; konum bulunamadı değil)"""
+
+
+# Ara sonuç bildirimi: (kaynak etiketi, ayrıştırılmış işletmeler)
+BatchCallback = Callable[[str, List[Dict]], Awaitable[None]]
+
 # Kategori eşleştirme - Türkçe ve İngilizce
 CATEGORY_MAPPING = {
     # Yeme-içme
@@ -146,15 +189,65 @@ class OpenStreetMapService:
     def __init__(self):
         self.nominatim_url = "https://nominatim.openstreetmap.org"
         self.overpass_url = "https://overpass-api.de/api/interpreter"
+        self.overpass_status_url = "https://overpass-api.de/api/status"
         self.headers = {
             "User-Agent": "BizFinder/2.0 (Business Discovery Platform)"
         }
+        self._client: Optional[httpx.AsyncClient] = None
     
-    async def geocode(self, location: str) -> Optional[Tuple[float, float]]:
-        """Lokasyonu koordinata çevir"""
-        async with httpx.AsyncClient() as client:
+    async def startup(self):
+        """Paylaşılan HTTP istemcisini oluştur (uygulama başlangıcında)"""
+        if self._client is None:
+            self._client = self._create_client()
+    
+    async def shutdown(self):
+        """Paylaşılan HTTP istemcisini kapat (uygulama kapanışında)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Tüm upstream çağrılarında kullanılan havuzlu istemci"""
+        if self._client is None:
+            # lifespan dışında (ör. script) kullanım için tembel oluşturma
+            self._client = self._create_client()
+        return self._client
+    
+    def _create_client(self) -> httpx.AsyncClient:
+        """Keep-alive ve bağlantı limitleri ayarlı istemci oluştur"""
+        http2 = OSM_HTTP2
+        if http2:
             try:
-                response = await client.get(
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("HTTP/2 için 'h2' paketi yüklü değil, HTTP/1.1 kullanılıyor")
+                http2 = False
+        
+        return httpx.AsyncClient(
+            headers=self.headers,
+            timeout=OSM_HTTP_TIMEOUT,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=OSM_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=OSM_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=OSM_HTTP_KEEPALIVE_EXPIRY
+            )
+        )
+    
+    async def geocode(self, location: str) -> Optional[Tuple[float, float]]:
+        """Lokasyonu koordinata çevir (önbellekli)"""
+        return await geocode_cache.get_or_fetch(location, self._geocode_upstream)
+    
+    async def _geocode_upstream(self, location: str) -> Optional[Tuple[float, float]]:
+        """Nominatim ile lokasyonu koordinata çevir
+
+        Sonuç yoksa None; zaman aşımı, HTTP hatası (429 dahil) ya da bozuk yanıtta
+        GeocodeUnavailable yükselir (önbelleğe "bulunamadı" olarak yazılmaz).
+        """
+        try:
+            async with nominatim_limiter.limit():
+                response = await self.client.get(
                     f"{self.nominatim_url}/search",
                     params={
                         "q": location,
@@ -162,14 +255,15 @@ class OpenStreetMapService:
                         "limit": 1,
                         "countrycodes": "tr"
                     },
-                    headers=self.headers,
                     timeout=30
                 )
-                data = response.json()
-                if data:
-                    return float(data[0]["lat"]), float(data[0]["lon"])
-            except Exception as e:
-                logger.error(f"Geocode hatası: {e}")
+            response.raise_for_status()
+            data = response.json()
+            if data:
+                return float(data[0]["lat"]), float(data[0]["lon"])
+        except (httpx.HTTPError, ValueError, KeyError, IndexError) as e:
+            logger.error(f"Geocode hatası: {e}")
+            raise GeocodeUnavailable(str(e)) from e
         return None
     
     def _get_osm_tags(self, business_type: str) -> List[str]:
@@ -201,79 +295,102 @@ class OpenStreetMapService:
         business_type: str,
         radius: int = 5000,
         max_results: int = 500,
-        polygon: Optional[List[List[float]]] = None
+        polygon: Optional[List[List[float]]] = None,
+        stats: Optional[Dict] = None,
+        tiled: Optional[bool] = None,
+        max_age_hours: Optional[float] = None,
+        on_batch: Optional[BatchCallback] = None,
+        priority: int = PRIORITY_INTERACTIVE
     ) -> List[Dict]:
-        """İşletmeleri ara"""
+        """İşletmeleri ara
+
+        `stats` verilirse Overpass önbellek isabet/ıskalama, yerel kapsama ve başarısız upstream
+        sorgu sayıları ile limitte kesilen tile olup olmadığı (`truncated`) bu sözlüğe yazılır.
+        `tiled` None ise alan OVERPASS_TILE_THRESHOLD_M eşiğini aştığında ızgaraya bölünür.
+        `max_age_hours` yerel kapsama ve Overpass önbelleği için tazelik penceresidir (None ise
+        COVERAGE_MAX_AGE_HOURS / OVERPASS_CACHE_TTL_HOURS; 0 ise her zaman upstream).
+        `on_batch` verilirse sonuca giren her parti (yerel, union, tile, fallback) tamamlandığı anda
+        bildirilir; partiler arası mükerrer temizliği ve `max_results` kesimi çağırana aittir.
+        `priority` upstream sorgularının zamanlayıcıdaki öncelik sınıfıdır.
+        """
         results = []
+        if stats is None:
+            stats = {}
+        stats.setdefault("cache_hits", 0)
+        stats.setdefault("cache_misses", 0)
+        stats.setdefault("local_hits", 0)
+        stats.setdefault("upstream_errors", 0)
+        stats.setdefault("truncated", False)
         osm_tags = self._get_osm_tags(business_type)
+        max_age = None if max_age_hours is None else timedelta(hours=max_age_hours)
         
         logger.info(f"Aranıyor: {business_type} -> Tags: {osm_tags}")
         
-        # Overpass sorgusu oluştur
+        # Overpass alan filtresi (koordinatlar önbellek için kuantize edilir)
         if polygon and len(polygon) >= 3:
             # Polygon bazlı arama
-            poly_str = " ".join([f"{p[0]} {p[1]}" for p in polygon])
+            poly_str = " ".join([f"{self._q(p[0])} {self._q(p[1])}" for p in polygon])
             area_filter = f'(poly:"{poly_str}")'
+            query_area = make_area(latitude, longitude, radius, [[self._q(p[0]), self._q(p[1])] for p in polygon])
         else:
             # Yarıçap bazlı arama
-            area_filter = f'(around:{radius},{latitude},{longitude})'
-        
-        # Her tag için arama yap
-        for tag in osm_tags[:2]:  # İlk 2 tag ile sınırla
-            if "=" in tag:
-                key, value = tag.split("=")
-                query = f"""
-                [out:json][timeout:60];
-                (
-                    node["{key}"="{value}"]{area_filter};
-                    way["{key}"="{value}"]{area_filter};
-                );
-                out center {max_results};
-                """
-            else:
-                query = f"""
-                [out:json][timeout:60];
-                (
-                    node["{tag}"]{area_filter};
-                    way["{tag}"]{area_filter};
-                );
-                out center {max_results};
-                """
+            area_filter = f'(around:{radius},{self._q(latitude)},{self._q(longitude)})'
+            query_area = make_area(self._q(latitude), self._q(longitude), radius)
+        
+        # İstenen alan (yerel yanıt) ve Overpass'a gerçekten sorulan kuantize alan (kapsama kaydı)
+        area = make_area(latitude, longitude, radius, polygon)
+        filters = [self._tag_filter(tag) for tag in osm_tags]
+        
+        # Aynı filtre seti için alanı tamamen kapsayan taze bir kayıt varsa upstream'e gidilmez
+        local = await coverage_index.lookup(coverage_index.make_key(filters), area, max_age)
+        fallback_stats = {"cache_hits": 0, "cache_misses": 0, "local_hits": 0, "upstream_errors": 0}
+        fallback_task = None
+        
+        if local is not None:
+            stats["local_hits"] += 1
+            logger.info(f"Kapsama indeksinden yerel yanıt: {len(local)} kayıt")
+            results.extend(local)
+            await self._emit(on_batch, "yerel", local)
+        else:
+            # İsim bazlı fallback spekülatif olarak hemen başlatılır,
+            # sonucu yalnızca tag araması yetersiz kalırsa kullanılır
+            fallback_task = asyncio.create_task(self._search_by_name(
+                area_filter, area, query_area, business_type, max_results, fallback_stats, max_age, priority
+            ))
+            
+            # Kategorinin tüm tag'leri tek bir union sorgusunda
+            # (büyük alanlarda her tile için ayrı union, eşzamanlı)
+            if tiled is None:
+                tiled = self._area_extent_m(latitude, longitude, radius, polygon) > OVERPASS_TILE_THRESHOLD_M
             
             try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.post(
-                        self.overpass_url,
-                        data={"data": query},
-                        headers=self.headers,
-                        timeout=60
+                if tiled:
+                    results.extend(await self._search_by_tiles(
+                        osm_tags, area, business_type, max_results, stats, max_age, on_batch, priority
+                    ))
+                else:
+                    tag_results = await self._search_by_tags(
+                        osm_tags, area_filter, query_area, business_type, max_results, stats, priority, max_age
                     )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        elements = data.get("elements", [])
-                        
-                        for element in elements:
-                            business = self._parse_element(element, business_type)
-                            if business and business["name"]:
-                                results.append(business)
-                        
-                        logger.info(f"Tag '{tag}' için {len(elements)} sonuç bulundu")
-                    
-                    # Rate limiting
-                    await asyncio.sleep(1)
-                    
-            except Exception as e:
-                logger.error(f"Overpass sorgu hatası: {e}")
-                continue
+                    results.extend(tag_results)
+                    await self._emit(on_batch, "etiket", tag_results)
+            except BaseException:
+                fallback_task.cancel()
+                raise
         
-        # İsim bazlı fallback arama
         if len(results) < 10:
-            logger.info("Fallback: İsim bazlı arama yapılıyor...")
-            fallback_results = await self._search_by_name(
-                latitude, longitude, business_type, radius, max_results
-            )
+            logger.info("Fallback: İsim bazlı arama sonuçları kullanılıyor...")
+            if fallback_task is None:
+                fallback_task = asyncio.create_task(self._search_by_name(
+                    area_filter, area, query_area, business_type, max_results, fallback_stats, max_age, priority
+                ))
+            fallback_results = await fallback_task
             results.extend(fallback_results)
+            await self._emit(on_batch, "isim", fallback_results)
+            for key in fallback_stats:
+                stats[key] += fallback_stats[key]
+        elif fallback_task is not None:
+            fallback_task.cancel()
         
         # Mükerrer temizle
         seen_ids = set()
@@ -283,46 +400,380 @@ class OpenStreetMapService:
                 seen_ids.add(r["place_id"])
                 unique_results.append(r)
         
-        logger.info(f"Toplam {len(unique_results)} benzersiz sonuç bulundu")
+        logger.info(
+            f"Toplam {len(unique_results)} benzersiz sonuç bulundu "
+            f"(önbellek: {stats['cache_hits']} isabet, {stats['cache_misses']} ıskalama, "
+            f"{stats['local_hits']} yerel kapsama)"
+        )
         return unique_results[:max_results]
     
-    async def _search_by_name(
-        self,
+    @staticmethod
+    async def _emit(on_batch: Optional[BatchCallback], source: str, businesses: List[Dict]):
+        """Boş olmayan partiyi çağırana bildir"""
+        if on_batch is not None and businesses:
+            await on_batch(source, businesses)
+    
+    @staticmethod
+    def _area_extent_m(
         latitude: float,
         longitude: float,
-        business_type: str,
         radius: int,
-        max_results: int
+        polygon: Optional[List[List[float]]]
+    ) -> float:
+        """Arama alanının yaklaşık yarıçapı (metre)"""
+        if polygon and len(polygon) >= 3:
+            south, west, north, east = polygon_bbox(polygon)
+            return haversine_m(south, west, north, east) / 2
+        return radius
+    
+    @staticmethod
+    def _q(value: float) -> float:
+        """Koordinatı önbellek hassasiyetine yuvarla"""
+        return round(value, OVERPASS_CACHE_PRECISION)
+    
+    async def _run_overpass(
+        self,
+        filters: List[str],
+        area_filter: str,
+        max_results: int,
+        stats: Dict,
+        priority: int = PRIORITY_INTERACTIVE,
+        max_age: Optional[timedelta] = None
+    ) -> Tuple[Optional[List[Dict]], Optional[datetime]]:
+        """Union sorgusunu önbellekten ya da zamanlayıcı üzerinden Overpass'tan getir
+
+        Döndürür: (elementler, upstream'den alınma zamanı). Önbellek `max_age` tazelik
+        penceresiyle sınırlanır (0 ise her zaman upstream). Aynı anda çalışan özdeş
+        sorgular tek upstream çağrısında birleştirilir.
+        """
+        filters = sorted(filters)
+        cache_key = overpass_cache.make_key(filters, area_filter, max_results)
+        description = f"{' '.join(filters)} {area_filter} limit={max_results}"
+        
+        cached = await overpass_cache.get(cache_key, max_age)
+        if cached is not None:
+            stats["cache_hits"] += 1
+            logger.info(f"Overpass önbellek isabeti: {description[:200]}")
+            return cached
+        
+        stats["cache_misses"] += 1
+        logger.info(f"Overpass önbellek ıskalaması: {description[:200]}")
+        
+        query = self._build_query(filters, area_filter, max_results)
+        try:
+            fetched = await overpass_scheduler.run(
+                cache_key,
+                lambda: self._fetch_overpass(query, cache_key, description),
+                priority=priority
+            )
+        except UpstreamOverloaded as e:
+            logger.warning(f"Overpass aşırı yüklü, sorgu yeniden denemelerden sonra bırakıldı: {e}")
+            fetched = None
+        
+        if fetched is None:
+            stats["upstream_errors"] += 1
+            return None, None
+        return fetched
+    
+    async def _fetch_overpass(
+        self,
+        query: str,
+        cache_key: str,
+        description: str
+    ) -> Optional[Tuple[List[Dict], datetime]]:
+        """Tek upstream çağrısı (zamanlayıcı slotu içinde); 429/504'te UpstreamOverloaded"""
+        fetched_at = datetime.utcnow()
+        response = await self.client.post(
+            self.overpass_url,
+            data={"data": query},
+            timeout=60
+        )
+        
+        if response.status_code in (429, 504):
+            raise UpstreamOverloaded(response.status_code, await self._overload_wait(response))
+        if response.status_code != 200:
+            logger.warning(f"Overpass HTTP {response.status_code} döndü")
+            return None
+        
+        elements = response.json().get("elements", [])
+        await overpass_cache.set(cache_key, description, elements)
+        return elements, fetched_at
+    
+    async def _overload_wait(self, response: httpx.Response) -> Optional[float]:
+        """Aşırı yükte beklenecek süre: Retry-After, yoksa /api/status'taki ilk boş slot"""
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+        try:
+            status = await self.client.get(self.overpass_status_url, timeout=10)
+            waits = [int(seconds) for seconds in re.findall(r"in (\d+) seconds", status.text)]
+            if waits:
+                return float(min(waits))
+        except Exception as e:
+            logger.warning(f"Overpass slot durumu okunamadı: {e}")
+        return None
+    
+    @staticmethod
+    def _tag_filter(tag: str) -> str:
+        """OSM tag'ini Overpass filtresine çevir ("key=value" veya yalnızca "key")"""
+        if "=" in tag:
+            key, value = tag.split("=", 1)
+            return f'["{key}"="{value}"]'
+        return f'["{tag}"]'
+    
+    def _build_query(self, filters: List[str], area_filter: str, max_results: int) -> str:
+        """Tüm filtreleri kapsayan tek bir union Overpass sorgusu oluştur"""
+        statements = "\n".join(
+            f"    nwr{tag_filter}{area_filter};" for tag_filter in filters
+        )
+        return (
+            "[out:json][timeout:60];\n"
+            "(\n"
+            f"{statements}\n"
+            ");\n"
+            f"out center {max_results};"
+        )
+    
+    @staticmethod
+    def _count_by_tag(elements: List[Dict], osm_tags: List[str]) -> Dict[str, int]:
+        """Union sonucundaki elementleri tag bazında say (log/metrik için)"""
+        counts = {tag: 0 for tag in osm_tags}
+        for element in elements:
+            element_tags = element.get("tags", {})
+            for tag in osm_tags:
+                key, _, value = tag.partition("=")
+                if key in element_tags and (not value or element_tags[key] == value):
+                    counts[tag] += 1
+        return counts
+    
+    async def _search_by_tags(
+        self,
+        osm_tags: List[str],
+        area_filter: str,
+        query_area: Dict,
+        business_type: str,
+        max_results: int,
+        stats: Dict,
+        priority: int = PRIORITY_INTERACTIVE,
+        max_age: Optional[timedelta] = None
     ) -> List[Dict]:
-        """İsim bazlı arama (fallback)"""
+        """Kategorinin tüm tag'leri için tek union sorgusu ile arama"""
         results = []
+        filters = [self._tag_filter(tag) for tag in osm_tags]
+        
+        try:
+            elements, fetched_at = await self._run_overpass(
+                filters, area_filter, max_results, stats, priority, max_age
+            )
+            if elements is not None:
+                for element in elements:
+                    business = self._parse_element(element, business_type)
+                    if business and business["name"]:
+                        results.append(business)
+                
+                for tag, count in self._count_by_tag(elements, osm_tags).items():
+                    logger.info(f"Tag '{tag}' için {count} sonuç bulundu")
+                
+                # Limitte kesilmiş sonuç alanı eksiksiz kapsamaz
+                if len(elements) < max_results:
+                    await coverage_index.record(
+                        coverage_index.make_key(filters), f"{' '.join(sorted(filters))} {area_filter}",
+                        query_area, results, fetched_at
+                    )
+        except Exception as e:
+            logger.error(f"Overpass sorgu hatası: {e}")
+            stats["upstream_errors"] += 1
         
-        query = f"""
-        [out:json][timeout:60];
-        (
-            node["name"~"{business_type}",i](around:{radius},{latitude},{longitude});
-            way["name"~"{business_type}",i](around:{radius},{latitude},{longitude});
-        );
-        out center {max_results};
+        return results
+    
+    async def _search_by_tiles(
+        self,
+        osm_tags: List[str],
+        area: Dict,
+        business_type: str,
+        max_results: int,
+        stats: Dict,
+        max_age: Optional[timedelta] = None,
+        on_batch: Optional[BatchCallback] = None,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> List[Dict]:
+        """Alanı global hizalı tile'lara bölerek ara, alana kırp
+
+        Tile'lar alan merkezine yakından uzağa, en fazla OVERPASS_MAX_CONCURRENT tanesi aynı anda
+        sorulur; `max_results` benzersiz sonuca ulaşılınca yeni tile başlatılmaz. Tile limiti
+        `max_results`'tır (en fazla OVERPASS_TILE_MAX_ELEMENTS). Limitte kesilen tile dört alt
+        tile'a bölünüp yeniden sorulur (OVERPASS_TILE_MAX_SPLITS kademeye kadar); en alt kademede
+        de kesilirse `stats["truncated"]` işaretlenir. Kapsama indeksinde taze olan tile'lar
+        (her kademede) yerelden gelir; `on_batch` her tile'ın yeni sonuçlarıyla çağrılır.
         """
+        filters = [self._tag_filter(tag) for tag in osm_tags]
+        coverage_key = coverage_index.make_key(filters)
+        tile_limit = max(1, min(max_results, OVERPASS_TILE_MAX_ELEMENTS))
+        center_south, center_west, center_north, center_east = area_bbox(area)
+        center = ((center_south + center_north) / 2, (center_west + center_east) / 2)
+        
+        if area["type"] == "polygon":
+            tiles = area_tiles(OVERPASS_TILE_SIZE_DEG, polygon=area["points"])
+        else:
+            tiles = area_tiles(
+                OVERPASS_TILE_SIZE_DEG,
+                latitude=area["lat"],
+                longitude=area["lon"],
+                radius_m=area["radius"]
+            )
+        
+        # Kuyruk öğesi: (ızgara indisi, tile boyu, bölünme kademesi)
+        def tile_id(item) -> str:
+            (ix, iy), size, _ = item
+            return f"{ix}:{iy}:{size}"
         
+        def nearest_first(items) -> List:
+            def distance(item):
+                south, west, north, east = tile_bbox(*item[0], item[1])
+                return haversine_m(center[0], center[1], (south + north) / 2, (west + east) / 2)
+            return sorted(items, key=distance)
+        
+        seen = set()
+        results = []
+        
+        async def accept(source: str, businesses: List[Dict]):
+            fresh = []
+            for business in businesses:
+                if business["place_id"] not in seen:
+                    seen.add(business["place_id"])
+                    fresh.append(business)
+            results.extend(fresh)
+            await self._emit(on_batch, source, fresh)
+        
+        async def uncovered(items) -> List:
+            """Yerel kapsamadaki tile'ları sonuca ekle, kalanları yakından uzağa döndür"""
+            covered = await coverage_index.lookup_tiles(
+                coverage_key, [tile_id(item) for item in items], area, max_age
+            )
+            stats["local_hits"] += len(covered)
+            for rows in covered.values():
+                await accept("yerel", rows)
+            return nearest_first([item for item in items if tile_id(item) not in covered])
+        
+        async def fetch_tile(item) -> List:
+            """Tile'ı sor; limitte kesildiyse sorulacak alt tile'ları döndür"""
+            tile, size, depth = item
+            # Tile sınırları global ızgaraya hizalı: önbellekte tek tek yeniden kullanılır
+            south, west, north, east = tile_bbox(*tile, size)
+            try:
+                elements, fetched_at = await self._run_overpass(
+                    filters, f"({south},{west},{north},{east})", tile_limit, stats, priority, max_age
+                )
+            except Exception as e:
+                logger.error(f"Tile {tile_id(item)} sorgu hatası: {e}")
+                stats["upstream_errors"] += 1
+                return []
+            if elements is None:
+                return []
+            
+            businesses = []
+            for element in elements:
+                business = self._parse_element(element, business_type)
+                if business and business["name"]:
+                    businesses.append(business)
+            
+            truncated = len(elements) >= tile_limit
+            if not truncated:
+                await coverage_index.record(
+                    coverage_key, f"{' '.join(sorted(filters))} tile={tile_id(item)}",
+                    {"type": "tile", "bbox": [south, west, north, east]},
+                    businesses, fetched_at, tile_id=tile_id(item)
+                )
+            
+            await accept(
+                f"tile {tile_id(item)}",
+                [b for b in businesses if point_in_area(b["latitude"], b["longitude"], area)]
+            )
+            if not truncated or len(seen) >= max_results:
+                return []
+            if depth >= OVERPASS_TILE_MAX_SPLITS:
+                logger.warning(f"Tile {tile_id(item)} limitte kesildi ({len(elements)} element), sonuçlar eksik")
+                stats["truncated"] = True
+                return []
+            
+            # Dörde böl (alt tile'lar da global ızgaraya hizalı)
+            half = size / 2
+            children = [
+                ((tile[0] * 2 + dx, tile[1] * 2 + dy), half, depth + 1)
+                for dy in (0, 1) for dx in (0, 1)
+            ]
+            children = [child for child in children if bbox_intersects_area(tile_bbox(*child[0], half), area)]
+            logger.info(f"Tile {tile_id(item)} limitte kesildi, {len(children)} alt tile'a bölünüyor")
+            return await uncovered(children)
+        
+        pending = deque(await uncovered([(tile, OVERPASS_TILE_SIZE_DEG, 0) for tile in tiles]))
+        local_count = len(results)
+        logger.info(
+            f"Alan {len(tiles)} tile'a bölündü ({OVERPASS_TILE_SIZE_DEG}°, tile limiti {tile_limit}), "
+            f"{len(tiles) - len(pending)} tile yerel kapsamada"
+        )
+        
+        running = set()
+        queried = 0
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.overpass_url,
-                    data={"data": query},
-                    headers=self.headers,
-                    timeout=60
+            while True:
+                while pending and len(running) < OVERPASS_MAX_CONCURRENT and len(seen) < max_results:
+                    running.add(asyncio.create_task(fetch_tile(pending.popleft())))
+                    queried += 1
+                if not running:
+                    break
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    # Alt tile'lar sıranın önüne (bölünen tile'ın yerini alır)
+                    pending.extendleft(reversed(task.result()))
+        finally:
+            for task in running:
+                task.cancel()
+        
+        logger.info(
+            f"Tile araması: {queried} tile sorgulandı, {len(pending)} tile gerekmedi; "
+            f"{local_count} yerel, {len(results) - local_count} upstream sonuç"
+        )
+        return results
+    
+    async def _search_by_name(
+        self,
+        area_filter: str,
+        area: Dict,
+        query_area: Dict,
+        business_type: str,
+        max_results: int,
+        stats: Dict,
+        max_age: Optional[timedelta] = None,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> List[Dict]:
+        """İsim bazlı arama (fallback)"""
+        results = []
+        
+        name_pattern = business_type.replace("\\", "\\\\").replace('"', '\\"')
+        filters = [f'["name"~"{name_pattern}",i]']
+        coverage_key = coverage_index.make_key(filters)
+        
+        local = await coverage_index.lookup(coverage_key, area, max_age)
+        if local is not None:
+            stats["local_hits"] += 1
+            return local
+        
+        try:
+            elements, fetched_at = await self._run_overpass(
+                filters, area_filter, max_results, stats, priority, max_age
+            )
+            for element in elements or []:
+                business = self._parse_element(element, business_type)
+                if business and business["name"]:
+                    results.append(business)
+            if elements is not None and len(elements) < max_results:
+                await coverage_index.record(
+                    coverage_key, f"{filters[0]} {area_filter}", query_area, results, fetched_at
                 )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    for element in data.get("elements", []):
-                        business = self._parse_element(element, business_type)
-                        if business and business["name"]:
-                            results.append(business)
         except Exception as e:
             logger.error(f"Fallback arama hatası: {e}")
+            stats["upstream_errors"] += 1
         
         return results
     
@@ -330,8 +781,8 @@ class OpenStreetMapService:
         """OSM elementini işletme formatına çevir"""
         tags = element.get("tags", {})
         
-        # Koordinatları al
-        if element["type"] == "way":
+        # Koordinatları al (way/relation için "out center" merkezi)
+        if element["type"] in ("way", "relation"):
             center = element.get("center", {})
             lat = center.get("lat")
             lon = center.get("lon")
@@ -0,0 +1,141 @@
+"""
+Overpass yanıt önbelleği
+(tag seti, kuantize alan, limit) anahtarlı, TTL ve boyut sınırlı, SQLite'ta sıkıştırılmış
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func
+
+from app.core.config import OVERPASS_CACHE_TTL_HOURS, OVERPASS_CACHE_MAX_MB
+from app.core.database import ReadSessionLocal, run_write
+from app.models.cache import OverpassCache
+
+logger = logging.getLogger(__name__)
+
+
+class OverpassCacheService:
+    """Overpass element listelerini sıkıştırılmış olarak saklayan önbellek"""
+
+    def __init__(self, ttl: timedelta, max_bytes: int):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(filters: Sequence[str], area_key: str, limit: int) -> str:
+        """Sıralı filtreler + kuantize alan + limit -> sabit uzunlukta anahtar"""
+        canonical = json.dumps(
+            {"filters": sorted(filters), "area": area_key, "limit": limit},
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _load(self, key: str, max_age: timedelta) -> Optional[Tuple[List[Dict], datetime]]:
+        """Geçerli kaydı ve upstream'den alınma zamanını oku (thread içinde, okuma havuzundan)"""
+        db = ReadSessionLocal()
+        try:
+            row = db.query(OverpassCache.payload, OverpassCache.created_at).filter(
+                OverpassCache.key == key,
+                OverpassCache.created_at >= datetime.utcnow() - max_age
+            ).first()
+        finally:
+            db.close()
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row.payload)), row.created_at
+
+    def _touch(self, db, key: str):
+        """Son erişim zamanını güncelle (LRU tahliyesi için, yazıcı kuyruğunda)"""
+        db.query(OverpassCache).filter(OverpassCache.key == key).update(
+            {OverpassCache.last_accessed_at: datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.commit()
+
+    def _store(self, db, key: str, description: str, payload: bytes, element_count: int):
+        """Yaz, ardından süresi dolanları ve boyut fazlasını temizle (yazıcı kuyruğunda)"""
+        now = datetime.utcnow()
+        db.merge(OverpassCache(
+            key=key,
+            description=description,
+            payload=payload,
+            element_count=element_count,
+            size_bytes=len(payload),
+            created_at=now,
+            last_accessed_at=now
+        ))
+        db.query(OverpassCache).filter(
+            OverpassCache.created_at < now - self.ttl
+        ).delete(synchronize_session=False)
+        db.flush()
+        self._evict(db)
+        db.commit()
+
+    def _evict(self, db):
+        """Toplam boyut sınırı aşıldıysa en uzun süre erişilmeyenleri sil (LRU)"""
+        total = db.query(func.coalesce(func.sum(OverpassCache.size_bytes), 0)).scalar()
+        if total <= self.max_bytes:
+            return
+
+        rows = db.query(OverpassCache.key, OverpassCache.size_bytes).order_by(
+            OverpassCache.last_accessed_at.asc()
+        ).all()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append(key)
+            total -= size or 0
+        if evicted:
+            db.query(OverpassCache).filter(
+                OverpassCache.key.in_(evicted)
+            ).delete(synchronize_session=False)
+            logger.info(f"Overpass önbelleğinden {len(evicted)} kayıt çıkarıldı")
+
+    async def get(
+        self,
+        key: str,
+        max_age: Optional[timedelta] = None
+    ) -> Optional[Tuple[List[Dict], datetime]]:
+        """Önbellekteki elementleri ve alınma zamanlarını döndür (yoksa None)
+
+        `max_age` verilirse önbellek TTL'inden kısa olan tazelik penceresi uygulanır
+        (0 ise önbellek hiç kullanılmaz).
+        """
+        max_age = self.ttl if max_age is None else min(max_age, self.ttl)
+        if max_age <= timedelta(0):
+            return None
+        try:
+            cached = await asyncio.to_thread(self._load, key, max_age)
+            if cached is not None:
+                await run_write(self._touch, key)
+            return cached
+        except Exception as e:
+            logger.error(f"Overpass önbellek okuma hatası: {e}")
+            return None
+
+    async def set(self, key: str, description: str, elements: List[Dict]):
+        """Elementleri sıkıştırıp önbelleğe yaz"""
+        try:
+            payload = await asyncio.to_thread(
+                lambda: zlib.compress(
+                    json.dumps(elements, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                )
+            )
+            await run_write(self._store, key, description, payload, len(elements))
+        except Exception as e:
+            logger.error(f"Overpass önbellek yazma hatası: {e}")
+
+
+# Singleton instance
+overpass_cache = OverpassCacheService(
+    ttl=timedelta(hours=OVERPASS_CACHE_TTL_HOURS),
+    max_bytes=int(OVERPASS_CACHE_MAX_MB * 1024 * 1024)
+)
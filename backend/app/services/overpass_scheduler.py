@@ -0,0 +1,226 @@
+"""
+Overpass zamanlayıcısı
+Aynı anda çalışan özdeş sorguları birleştirir (singleflight), slot + token bucket ile
+kabul eder, etkileşimli aramaları arka plan işlerinin önüne alır ve 429/504'te geri çekilir
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import (
+    OVERPASS_RATE_PER_SECOND,
+    OVERPASS_BURST,
+    OVERPASS_MAX_CONCURRENT,
+    OVERPASS_BACKOFF_BASE_SECONDS,
+    OVERPASS_BACKOFF_MAX_SECONDS,
+    OVERPASS_OVERLOAD_RETRIES
+)
+
+logger = logging.getLogger(__name__)
+
+# Öncelik sınıfları (küçük değer önce kabul edilir)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+
+class UpstreamOverloaded(Exception):
+    """Overpass aşırı yüklü (429/504); `retry_after` saniye sonra yeniden denenebilir"""
+
+    def __init__(self, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(f"Overpass HTTP {status_code}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class _Ticket:
+    """Kabul sırasındaki tek bir istek"""
+
+    __slots__ = ("priority", "future")
+
+    def __init__(self, priority: int, future: asyncio.Future):
+        self.priority = priority
+        self.future = future
+
+
+class _Flight:
+    """Devam eden upstream çağrısı ve ona bağlanan bekleyenler"""
+
+    __slots__ = ("task", "ticket", "waiters")
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.ticket: Optional[_Ticket] = None
+        self.waiters = 1
+
+
+class OverpassScheduler:
+    """Paylaşılan Overpass erişim zamanlayıcısı
+
+    `slots` aynı anda açık istek sayısı (Overpass'ın IP başına slot sayısı), `rate` ve
+    `burst` yeni istek kabul hızını belirleyen token bucket'tır. Aşırı yük yanıtlarında
+    `retry_after` (yoksa üstel geri çekilme) süresince yeni istek kabul edilmez.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        slots: int,
+        backoff_base: float,
+        backoff_max: float,
+        overload_retries: int
+    ):
+        if rate <= 0:
+            raise ValueError("rate pozitif olmalı")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.slots = max(1, slots)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.overload_retries = overload_retries
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._active = 0
+        self._waiting: List[Tuple[int, int, _Ticket]] = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._paused_until = 0.0
+        self._failures = 0
+        self._flights: Dict[str, _Flight] = {}
+
+    async def run(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> Any:
+        """`fetch` sonucunu döndür; aynı anahtarla süren çağrı varsa ona bağlan
+
+        Upstream çağrısı ayrı bir task'ta çalışır: bekleyenlerden biri iptal edilse de
+        diğerleri (ve önbelleğe yazma) etkilenmez. Yüksek öncelikli bir bekleyen, henüz
+        kabul edilmemiş çağrının önceliğini yükseltir.
+        """
+        flight = self._flights.get(key)
+        if flight is not None:
+            flight.waiters += 1
+            ticket = flight.ticket
+            if ticket is not None and priority < ticket.priority and not ticket.future.done():
+                ticket.priority = priority
+                heapq.heappush(self._waiting, (priority, next(self._seq), ticket))
+                self._dispatch()
+            logger.info(f"Overpass sorgusu birleştirildi ({flight.waiters} bekleyen)")
+            return await asyncio.shield(flight.task)
+
+        flight = _Flight()
+        self._flights[key] = flight
+        flight.task = asyncio.create_task(self._run_flight(key, flight, fetch, priority))
+        return await asyncio.shield(flight.task)
+
+    async def _run_flight(
+        self,
+        key: str,
+        flight: _Flight,
+        fetch: Callable[[], Awaitable[Any]],
+        priority: int
+    ) -> Any:
+        """Slot al, çağrıyı yap; aşırı yükte geri çekilip sınırlı sayıda yeniden dene"""
+        try:
+            attempt = 0
+            while True:
+                flight.ticket = _Ticket(priority, asyncio.get_running_loop().create_future())
+                await self._acquire(flight.ticket)
+                # Yükseltilmiş öncelik yeniden denemelerde de korunur
+                priority = flight.ticket.priority
+                try:
+                    result = await fetch()
+                except UpstreamOverloaded as e:
+                    self._penalize(e)
+                    attempt += 1
+                    if attempt > self.overload_retries:
+                        raise
+                    continue
+                finally:
+                    self._release()
+                self._failures = 0
+                return result
+        finally:
+            self._flights.pop(key, None)
+
+    async def _acquire(self, ticket: _Ticket):
+        """Kabul sırasına gir ve slot + token verilene kadar bekle"""
+        heapq.heappush(self._waiting, (ticket.priority, next(self._seq), ticket))
+        self._dispatch()
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket.future.done() and not ticket.future.cancelled():
+                # Kabul edildikten hemen sonra iptal: slotu geri ver
+                self._release()
+            else:
+                ticket.future.cancel()
+            raise
+
+    def _release(self):
+        """Slotu bırak ve sıradakini kabul et"""
+        self._active -= 1
+        self._dispatch()
+
+    def _refill(self, now: float):
+        """Geçen süreye göre token ekle"""
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def _dispatch(self):
+        """Boş slot, token ve geri çekilme durumuna göre öncelik sırasıyla kabul et"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        now = time.monotonic()
+        self._refill(now)
+        while self._waiting and self._active < self.slots:
+            priority, _, ticket = self._waiting[0]
+            if ticket.future.done() or priority != ticket.priority:
+                # İptal edilmiş ya da önceliği yükseltilmiş (eski) kayıt
+                heapq.heappop(self._waiting)
+                continue
+            if now < self._paused_until:
+                self._schedule(self._paused_until - now)
+                return
+            if self._tokens < 1:
+                self._schedule((1 - self._tokens) / self.rate)
+                return
+            heapq.heappop(self._waiting)
+            self._tokens -= 1
+            self._active += 1
+            ticket.future.set_result(None)
+
+    def _schedule(self, delay: float):
+        """Token dolunca / geri çekilme bitince tekrar kabul dene"""
+        self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def _penalize(self, error: UpstreamOverloaded):
+        """Aşırı yük yanıtı: kabulü durdur, kovayı boşalt"""
+        self._failures += 1
+        delay = error.retry_after
+        if delay is None:
+            delay = self.backoff_base * 2 ** (self._failures - 1)
+        delay = min(delay, self.backoff_max)
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        self._tokens = 0.0
+        logger.warning(f"Overpass HTTP {error.status_code}: {delay:.0f} sn boyunca yeni sorgu gönderilmeyecek")
+
+
+# Singleton instance
+overpass_scheduler = OverpassScheduler(
+    rate=OVERPASS_RATE_PER_SECOND,
+    burst=OVERPASS_BURST,
+    slots=OVERPASS_MAX_CONCURRENT,
+    backoff_base=OVERPASS_BACKOFF_BASE_SECONDS,
+    backoff_max=OVERPASS_BACKOFF_MAX_SECONDS,
+    overload_retries=OVERPASS_OVERLOAD_RETRIES
+)
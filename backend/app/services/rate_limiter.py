@@ -0,0 +1,55 @@
+"""
+Asenkron hız sınırlayıcı
+Upstream servislere (Overpass, Nominatim) nazik erişim için token bucket + eşzamanlılık limiti
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+
+class AsyncRateLimiter:
+    """Token bucket tabanlı asenkron hız sınırlayıcı
+
+    `rate` saniyede üretilen token sayısı, `burst` kovanın kapasitesidir.
+    `max_concurrent` verilirse aynı anda açık istek sayısı da sınırlanır.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, max_concurrent: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("rate pozitif olmalı")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(max_concurrent) if max_concurrent else None
+
+    def _refill(self):
+        """Geçen süreye göre token ekle"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self):
+        """Bir token alınana kadar bekle"""
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                # Kilidi tutarak bekle: sıradaki istekler FIFO ilerler
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    @asynccontextmanager
+    async def limit(self):
+        """Token + eşzamanlılık slotu al, blok bitince slotu bırak"""
+        if self._semaphore is None:
+            await self.acquire()
+            yield
+            return
+
+        async with self._semaphore:
+            await self.acquire()
+            yield
@@ -0,0 +1,339 @@
+"""
+Arka plan arama işleri
+SQLite'ta kalıcı kuyruk + sınırlı sayıda async işçi; aynı parametreli bekleyen işler
+tekilleştirilir, geçici hatalar üstel geri çekilmeyle yeniden denenir
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    SEARCH_JOB_WORKERS,
+    SEARCH_JOB_MAX_ATTEMPTS,
+    SEARCH_JOB_RETRY_BASE_SECONDS,
+    SEARCH_JOB_POLL_SECONDS,
+    SEARCH_JOB_RETENTION_HOURS
+)
+from app.core.database import run_write
+from app.core.text import normalize_key
+from app.models.search_job import SearchJob
+from app.services.overpass_scheduler import PRIORITY_BACKGROUND
+from app.services.search_pipeline import LocationNotFound, search_pipeline
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class SearchJobService:
+    """Arama işlerini kalıcı kuyruktan alıp sınırlı eşzamanlılıkla çalıştıran servis"""
+
+    def __init__(
+        self,
+        workers: int,
+        max_attempts: int,
+        retry_base: float,
+        poll_interval: float,
+        retention: timedelta
+    ):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._tasks: List[asyncio.Task] = []
+        self._wake: Optional[asyncio.Event] = None
+
+    @staticmethod
+    def params_hash(params: Dict) -> str:
+        """Kanonik parametre özeti (konum/tür yazım farkları aynı işe düşer)"""
+        canonical = dict(params)
+        canonical["location"] = normalize_key(canonical.get("location"))
+        canonical["business_type"] = normalize_key(canonical.get("business_type"))
+        payload = json.dumps(canonical, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def to_dict(job: SearchJob) -> Dict:
+        """Durum yanıtı"""
+        return {
+            "id": job.id,
+            "status": job.status,
+            "params": json.loads(job.params),
+            "attempts": job.attempts,
+            "batches": job.batches,
+            "found_count": job.found_count,
+            "new_count": job.new_count,
+            "duplicate_count": job.duplicate_count,
+            "cache_status": job.cache_status,
+            "error": job.error,
+            "next_run_at": job.next_run_at if job.status == "queued" else None,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+        }
+
+    async def startup(self):
+        """Yarım kalan işleri kuyruğa geri al, işçileri başlat (uygulama başlangıcında)"""
+        requeued = await run_write(self._requeue_interrupted)
+        if requeued:
+            logger.info(f"{requeued} yarım kalmış arama işi yeniden kuyruğa alındı")
+        self._wake = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"search-job-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def shutdown(self):
+        """İşçileri durdur; çalışan işler bir sonraki başlangıçta devam eder"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, params: Dict, user_id: Optional[int] = None) -> Tuple[Dict, bool]:
+        """İşi kuyruğa al: (iş durumu, yeni oluşturuldu mu)"""
+        job, created = await run_write(self._enqueue, params, user_id)
+        if created and self._wake is not None:
+            self._wake.set()
+        return job, created
+
+    def get(self, db: Session, job_id: str) -> Optional[Dict]:
+        """İş durumunu getir"""
+        job = db.get(SearchJob, job_id)
+        return self.to_dict(job) if job else None
+
+    # --- Yazıcı kuyruğunda çalışan adımlar ---
+
+    def _requeue_interrupted(self, db: Session) -> int:
+        """Önceki çalıştırmada 'running' kalan işleri tekrar 'queued' yap
+
+        Deneme hakkını doldurmuş işler başarısız sayılır; aksi halde süreci her seferinde
+        çökerten bir iş her başlangıçta sonsuza dek yeniden alınırdı.
+        """
+        now = datetime.utcnow()
+        exhausted = db.query(SearchJob).filter(
+            SearchJob.status == "running",
+            SearchJob.attempts >= self.max_attempts
+        ).update(
+            {
+                SearchJob.status: "failed",
+                SearchJob.error: "İş yarıda kesildi ve deneme hakkı tükendi",
+                SearchJob.finished_at: now,
+                SearchJob.updated_at: now
+            },
+            synchronize_session=False
+        )
+        if exhausted:
+            logger.warning(f"{exhausted} yarım kalmış arama işi deneme hakkı tükendiği için başarısız sayıldı")
+        count = db.query(SearchJob).filter(SearchJob.status == "running").update(
+            {
+                SearchJob.status: "queued",
+                SearchJob.next_run_at: now,
+                SearchJob.updated_at: now
+            },
+            synchronize_session=False
+        )
+        db.commit()
+        return count
+
+    def _enqueue(self, db: Session, params: Dict, user_id: Optional[int]) -> Tuple[Dict, bool]:
+        """Aynı parametreli bekleyen/çalışan iş varsa onu döndür, yoksa yeni iş ekle"""
+        now = datetime.utcnow()
+        db.query(SearchJob).filter(
+            SearchJob.finished_at < now - self.retention
+        ).delete(synchronize_session=False)
+
+        params_hash = self.params_hash(params)
+        existing = db.query(SearchJob).filter(
+            SearchJob.params_hash == params_hash,
+            SearchJob.status.in_(ACTIVE_STATUSES)
+        ).first()
+        if existing:
+            db.commit()
+            return self.to_dict(existing), False
+
+        job = SearchJob(
+            id=uuid.uuid4().hex,
+            params_hash=params_hash,
+            params=json.dumps(params, ensure_ascii=False),
+            user_id=user_id,
+            status="queued",
+            attempts=0,
+            next_run_at=now,
+            created_at=now,
+            updated_at=now
+        )
+        db.add(job)
+        db.commit()
+        return self.to_dict(job), True
+
+    def _claim(self, db: Session) -> Tuple[Optional[Dict], Optional[datetime]]:
+        """Zamanı gelmiş en eski işi 'running' olarak al
+
+        İş yoksa (None, bekleyen ilk işin zamanı) döner; tek yazıcı sayesinde iki işçi
+        aynı işi alamaz.
+        """
+        now = datetime.utcnow()
+        job = db.query(SearchJob).filter(
+            SearchJob.status == "queued",
+            SearchJob.next_run_at <= now
+        ).order_by(SearchJob.next_run_at, SearchJob.created_at).first()
+        if job is None:
+            next_run_at = db.query(func.min(SearchJob.next_run_at)).filter(
+                SearchJob.status == "queued"
+            ).scalar()
+            return None, next_run_at
+
+        job.status = "running"
+        job.attempts = (job.attempts or 0) + 1
+        job.started_at = now
+        job.updated_at = now
+        # Her deneme aramayı baştan yapar (önceki denemede kaydedilenler mükerrer sayılır)
+        job.batches = job.found_count = job.new_count = job.duplicate_count = 0
+        db.commit()
+        return {
+            "id": job.id,
+            "params": json.loads(job.params),
+            "user_id": job.user_id,
+            "attempts": job.attempts
+        }, None
+
+    def _update(self, db: Session, job_id: str, values: Dict):
+        """İş kolonlarını güncelle"""
+        values["updated_at"] = datetime.utcnow()
+        db.query(SearchJob).filter(SearchJob.id == job_id).update(
+            {getattr(SearchJob, key): value for key, value in values.items()},
+            synchronize_session=False
+        )
+        db.commit()
+
+    # --- İşçiler ---
+
+    async def _worker(self):
+        """Kuyruktan iş al ve çalıştır; iş yoksa bildirim ya da sonraki deneme zamanını bekle"""
+        while True:
+            # Talepten önce temizle: talep sırasında gelen bildirim kaybolmaz, bekleme hemen biter
+            self._wake.clear()
+            try:
+                claimed, next_run_at = await run_write(self._claim)
+            except Exception as e:
+                logger.error(f"Arama işi kuyruğu okunamadı: {e}")
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            if claimed is not None:
+                try:
+                    await self._execute(claimed)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # Durum yazılamadı (ör. veritabanı kilitli): işçi ölmez, iş yeniden planlanır
+                    logger.error(f"Arama işi {claimed['id']} sonlandırılamadı: {e}")
+                    await self._recover(claimed)
+                continue
+
+            timeout = self.poll_interval
+            if next_run_at is not None:
+                wait = (next_run_at - datetime.utcnow()).total_seconds()
+                timeout = min(timeout, max(wait, 0))
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _execute(self, claimed: Dict):
+        """Aramayı ortak hat üzerinden çalıştır, her partide ilerlemeyi yaz"""
+        job_id, attempts = claimed["id"], claimed["attempts"]
+        progress = {"batches": 0, "found_count": 0, "new_count": 0, "duplicate_count": 0}
+        stats: Dict = {}
+        logger.info(f"Arama işi {job_id} başladı (deneme {attempts})")
+
+        try:
+            async for event in search_pipeline.stream(
+                **claimed["params"], user_id=claimed["user_id"], priority=PRIORITY_BACKGROUND
+            ):
+                if event["event"] == "batch":
+                    progress["batches"] += 1
+                    progress["new_count"] += event["new_count"]
+                    progress["duplicate_count"] += event["duplicate_count"]
+                    progress["found_count"] += event["new_count"] + event["duplicate_count"]
+                    await run_write(self._update, job_id, dict(progress))
+                elif event["event"] == "done":
+                    stats = event["stats"]
+        except asyncio.CancelledError:
+            # Kapanış: iş 'running' kalır, sonraki başlangıçta yeniden kuyruğa alınır
+            raise
+        except LocationNotFound as e:
+            # Bulunamayan konum: tekrar denemek sonucu değiştirmez (Nominatim kesintisi
+            # GeocodeUnavailable olarak aşağıda yeniden denenir)
+            await self._finish(job_id, "failed", error=str(e))
+            return
+        except Exception as e:
+            logger.error(f"Arama işi {job_id} hatası: {e}")
+            await self._retry_or_fail(job_id, attempts, f"Arama hatası: {e}")
+            return
+
+        upstream_errors = stats.get("upstream_errors", 0)
+        if upstream_errors and attempts < self.max_attempts:
+            # Başarılı sorgular önbellekte/kapsamada: yeniden denemede yalnızca eksikler sorulur
+            await self._retry_or_fail(job_id, attempts, f"{upstream_errors} upstream sorgusu başarısız")
+            return
+
+        warnings = []
+        if upstream_errors:
+            warnings.append(f"{upstream_errors} upstream sorgusu başarısız")
+        if stats.get("truncated"):
+            warnings.append("limitte kesilen tile var")
+        await self._finish(
+            job_id,
+            "done",
+            cache_status=search_pipeline.cache_status(stats),
+            error=f"{', '.join(warnings)}, sonuçlar eksik olabilir" if warnings else None
+        )
+
+    async def _retry_or_fail(self, job_id: str, attempts: int, error: str):
+        """Deneme hakkı varsa geri çekilmeyle yeniden kuyruğa al, yoksa başarısız say"""
+        if attempts >= self.max_attempts:
+            await self._finish(job_id, "failed", error=error)
+            return
+        delay = self.retry_base * 2 ** (attempts - 1)
+        logger.warning(f"Arama işi {job_id} {delay:.0f} sn sonra yeniden denenecek: {error}")
+        await run_write(self._update, job_id, {
+            "status": "queued",
+            "error": error,
+            "next_run_at": datetime.utcnow() + timedelta(seconds=delay)
+        })
+
+    async def _recover(self, claimed: Dict):
+        """Durumu yazılamayan işi yeniden planla; o da olmazsa sonraki başlangıca bırak"""
+        try:
+            await self._retry_or_fail(claimed["id"], claimed["attempts"], "İş durumu kaydedilemedi")
+        except Exception as e:
+            # İş 'running' kalır: sonraki başlangıçta yeniden kuyruğa alınır
+            logger.error(f"Arama işi {claimed['id']} yeniden planlanamadı: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _finish(self, job_id: str, status: str, **values):
+        """İşi sonlandır"""
+        values.update(status=status, finished_at=datetime.utcnow())
+        await run_write(self._update, job_id, values)
+        logger.info(f"Arama işi {job_id}: {status}")
+
+
+# Singleton instance
+search_jobs = SearchJobService(
+    workers=SEARCH_JOB_WORKERS,
+    max_attempts=SEARCH_JOB_MAX_ATTEMPTS,
+    retry_base=SEARCH_JOB_RETRY_BASE_SECONDS,
+    poll_interval=SEARCH_JOB_POLL_SECONDS,
+    retention=timedelta(hours=SEARCH_JOB_RETENTION_HOURS)
+)
@@ -0,0 +1,181 @@
+"""
+Arama hattı
+Konum çözümleme -> upstream arama -> mükerrer temizliği -> mikro partilerle kayıt;
+akışlı arama endpoint'i her adımı tamamlandığı anda olay olarak yayınlar
+"""
+
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from app.core.config import SEARCH_STREAM_BATCH_SIZE
+from app.core.database import run_write
+from app.services.business_store import bulk_ingest
+from app.services.osm_service import osm_service
+from app.services.overpass_scheduler import PRIORITY_INTERACTIVE
+
+logger = logging.getLogger(__name__)
+
+
+class LocationNotFound(ValueError):
+    """Konum geocode edilemedi (Nominatim sonuç döndürmedi; yeniden denemek sonucu değiştirmez)"""
+
+
+class SearchPipeline:
+    """Arama sonuçlarını geldikçe kaydeden ortak hat"""
+
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+
+    @staticmethod
+    def cache_status(stats: Dict) -> str:
+        """Overpass önbellek ve yerel kapsama sayılarını tek bir duruma indir"""
+        hits = stats.get("cache_hits", 0)
+        misses = stats.get("cache_misses", 0)
+        local = stats.get("local_hits", 0)
+        if local and not hits and not misses:
+            return "yerel"
+        if (hits or local) and not misses:
+            return "isabet"
+        if hits or local:
+            return "kısmi"
+        return "ıskalama"
+
+    @staticmethod
+    def center_source(
+        location: Optional[str],
+        latitude: Optional[float],
+        longitude: Optional[float],
+        polygon: Optional[List[List[float]]]
+    ) -> str:
+        """Merkezin nereden çözüleceği (koordinat, konum, polygon); yoksa ValueError"""
+        if latitude and longitude:
+            return "koordinat"
+        if location:
+            return "konum"
+        if polygon and len(polygon) >= 3:
+            return "polygon"
+        raise ValueError("Konum belirtilmeli")
+
+    async def resolve_center(
+        self,
+        location: Optional[str],
+        latitude: Optional[float],
+        longitude: Optional[float],
+        polygon: Optional[List[List[float]]]
+    ) -> Tuple[float, float, str]:
+        """Arama merkezini çöz: (enlem, boylam, kaynak)
+
+        Konum bulunamazsa LocationNotFound, Nominatim'e ulaşılamazsa GeocodeUnavailable yükselir.
+        """
+        source = self.center_source(location, latitude, longitude, polygon)
+        if source == "koordinat":
+            return latitude, longitude, source
+        if source == "konum":
+            coords = await osm_service.geocode(location)
+            if not coords:
+                raise LocationNotFound("Konum bulunamadı")
+            return coords[0], coords[1], source
+        # Polygon'un merkezini hesapla
+        lats = [p[0] for p in polygon]
+        lons = [p[1] for p in polygon]
+        return sum(lats) / len(lats), sum(lons) / len(lons), source
+
+    async def stream(
+        self,
+        location: Optional[str],
+        latitude: Optional[float],
+        longitude: Optional[float],
+        polygon: Optional[List[List[float]]],
+        business_type: str,
+        radius: int,
+        max_results: int,
+        tiled: Optional[bool] = None,
+        max_age_hours: Optional[float] = None,
+        user_id: Optional[int] = None,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> AsyncIterator[Dict]:
+        """Arama olaylarını sırayla üret: geocode, batch (kaydedilmiş satırlarla), done
+
+        Upstream'den gelen her parti mükerrerlerden arındırılır, `batch_size`'lık parçalar
+        halinde yazıcı kuyruğunda kaydedilir ve hemen yayınlanır. Tüketici vazgeçerse
+        (istemci bağlantıyı keserse) süren arama iptal edilir. `priority` Overpass
+        zamanlayıcısındaki öncelik sınıfıdır (arka plan işleri etkileşimli aramaların arkasında kalır).
+        """
+        lat, lon, source = await self.resolve_center(location, latitude, longitude, polygon)
+        yield {"event": "geocode", "latitude": lat, "longitude": lon, "source": source}
+
+        queue: asyncio.Queue = asyncio.Queue()
+        stats: Dict = {}
+
+        async def on_batch(batch_source: str, businesses: List[Dict]):
+            await queue.put((batch_source, businesses))
+
+        async def run_search():
+            try:
+                await osm_service.search_businesses(
+                    latitude=lat,
+                    longitude=lon,
+                    business_type=business_type,
+                    radius=radius,
+                    max_results=max_results,
+                    polygon=polygon,
+                    stats=stats,
+                    tiled=tiled,
+                    max_age_hours=max_age_hours,
+                    on_batch=on_batch,
+                    priority=priority
+                )
+            finally:
+                await queue.put(None)
+
+        task = asyncio.create_task(run_search())
+        seen = set()
+        new_total = duplicate_total = 0
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                batch_source, businesses = item
+
+                fresh = []
+                for business in businesses:
+                    if len(seen) >= max_results:
+                        break
+                    if business["place_id"] not in seen:
+                        seen.add(business["place_id"])
+                        fresh.append(business)
+
+                for i in range(0, len(fresh), self.batch_size):
+                    chunk = fresh[i:i + self.batch_size]
+                    new_count, duplicate_count, saved = await run_write(
+                        bulk_ingest, chunk, user_id=user_id, response_limit=len(chunk)
+                    )
+                    new_total += new_count
+                    duplicate_total += duplicate_count
+                    yield {
+                        "event": "batch",
+                        "source": batch_source,
+                        "new_count": new_count,
+                        "duplicate_count": duplicate_count,
+                        "businesses": saved
+                    }
+            # Aramanın kendisi hata verdiyse burada yükselir
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+
+        logger.info(f"Akışlı arama tamamlandı: {new_total} yeni, {duplicate_total} mükerrer")
+        yield {
+            "event": "done",
+            "new_count": new_total,
+            "duplicate_count": duplicate_total,
+            "total_found": len(seen),
+            "stats": stats
+        }
+
+
+# Singleton instance
+search_pipeline = SearchPipeline(batch_size=SEARCH_STREAM_BATCH_SIZE)
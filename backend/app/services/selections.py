@@ -0,0 +1,118 @@
+"""
+Seçim servisi
+Filtre tanımı + dahil/hariç ID kümelerini kısa bir token altında saklar;
+dışa aktarım ve toplu işlemler ID listesi yerine token kullanır
+"""
+
+import json
+import secrets
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import SELECTION_TTL_HOURS
+from app.core.id_set import count_ids, decode_id_set, encode_id_set
+from app.models.business import Business
+from app.models.selection import Selection
+from app.services.business_filters import FILTER_KEYS, apply_business_filters, id_ranges_filter
+
+
+class SelectionService:
+    """Token ile adreslenen sunucu tarafı seçimler"""
+
+    def __init__(self, ttl: timedelta):
+        self.ttl = ttl
+
+    @staticmethod
+    def canonical_filters(filters: Optional[Dict]) -> Optional[Dict]:
+        """Boş değerleri at, anahtarları sırala (boş tanım -> None)"""
+        if not filters:
+            return None
+        unknown = set(filters) - set(FILTER_KEYS)
+        if unknown:
+            raise ValueError(f"Geçersiz filtre: {', '.join(sorted(unknown))}")
+        canonical = {
+            key: filters[key] for key in sorted(filters)
+            if filters[key] not in (None, "", False)
+        }
+        return canonical or None
+
+    def apply(self, query, selection: Selection):
+        """Sorguyu seçimle sınırla
+
+        Filtre tanımı her kullanımda yeniden değerlendirilir (canlı); dahil edilen ID'ler
+        filtre eşleşmelerine eklenir, hariç tutulanlar her durumda çıkarılır.
+        """
+        filters = json.loads(selection.filters) if selection.filters else None
+        include = decode_id_set(selection.include_ids) if selection.include_ids else []
+        exclude = decode_id_set(selection.exclude_ids) if selection.exclude_ids else []
+
+        if filters and not include:
+            query = apply_business_filters(query, **filters)
+        elif filters:
+            matched = apply_business_filters(select(Business.id), **filters)
+            query = query.filter(or_(Business.id.in_(matched), id_ranges_filter(include)))
+        else:
+            query = query.filter(id_ranges_filter(include))
+
+        if exclude:
+            query = query.filter(~id_ranges_filter(exclude))
+        return query
+
+    def create(
+        self,
+        db: Session,
+        filters: Optional[Dict],
+        include_ids: Iterable[int],
+        exclude_ids: Iterable[int],
+        user_id: Optional[int] = None
+    ) -> Selection:
+        """Seçimi kaydet, eşleşen kayıt sayısını hesapla"""
+        filters = self.canonical_filters(filters)
+        include_ids = list(include_ids)
+        exclude_ids = list(exclude_ids)
+        if filters is None and not include_ids:
+            raise ValueError("Filtre veya dahil edilecek ID belirtilmeli")
+
+        now = datetime.utcnow()
+        db.query(Selection).filter(Selection.expires_at < now).delete(synchronize_session=False)
+
+        selection = Selection(
+            token=secrets.token_urlsafe(12),
+            filters=json.dumps(filters, ensure_ascii=False) if filters else None,
+            include_ids=encode_id_set(include_ids) if include_ids else None,
+            exclude_ids=encode_id_set(exclude_ids) if exclude_ids else None,
+            user_id=user_id,
+            created_at=now,
+            expires_at=now + self.ttl
+        )
+        selection.total = self.apply(db.query(func.count(Business.id)), selection).scalar()
+        db.add(selection)
+        db.commit()
+        return selection
+
+    def get(self, db: Session, token: str) -> Optional[Selection]:
+        """Süresi dolmamış seçimi getir"""
+        return db.query(Selection).filter(
+            Selection.token == token,
+            Selection.expires_at >= datetime.utcnow()
+        ).first()
+
+    @staticmethod
+    def summary(selection: Selection) -> Dict:
+        """Seçim özeti (yanıt için)"""
+        return {
+            "token": selection.token,
+            "filters": json.loads(selection.filters) if selection.filters else None,
+            "include_count": count_ids(decode_id_set(selection.include_ids)) if selection.include_ids else 0,
+            "exclude_count": count_ids(decode_id_set(selection.exclude_ids)) if selection.exclude_ids else 0,
+            "total": selection.total or 0,
+            "created_at": selection.created_at,
+            "expires_at": selection.expires_at,
+        }
+
+
+# Singleton instance
+selection_service = SelectionService(ttl=timedelta(hours=SELECTION_TTL_HOURS))
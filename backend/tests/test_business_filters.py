@@ -0,0 +1,64 @@
+"""
+İşletme filtreleri testleri
+"""
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.schema import init_db
+from app.core.storage import configure_engine
+from app.models.business import Business
+from app.services.business_filters import compile_filters, id_ranges_filter, id_set_filter
+
+
+def _session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    configure_engine(engine)
+    init_db(engine)
+    return sessionmaker(bind=engine)()
+
+
+def _add(db, place_id, lat, lon):
+    db.add(Business(place_id=place_id, name=place_id, business_type="kafe", latitude=lat, longitude=lon))
+
+
+def test_bbox_and_near_are_both_applied(tmp_path):
+    db = _session(tmp_path)
+    # near dairesi içinde iki nokta; yalnızca biri bbox içinde
+    _add(db, "inside_both", 41.000, 29.000)
+    _add(db, "near_only", 41.000, 29.010)
+    _add(db, "far", 41.500, 29.500)
+    db.commit()
+
+    compiled = compile_filters(
+        bbox=(40.99, 28.99, 41.01, 29.005),
+        near=(41.0, 29.0),
+        radius=2000
+    )
+    rows = db.execute(compiled.apply(select(Business.place_id))).scalars().all()
+    assert rows == ["inside_both"]
+
+    # Her kutu kendi parametreleriyle derlenir
+    params = compiled.apply(select(Business.id)).compile().params
+    assert 29.005 in params.values()
+    db.close()
+
+
+def test_id_ranges_filter_matches_closed_ranges(tmp_path):
+    db = _session(tmp_path)
+    for i in range(10):
+        _add(db, f"p{i}", 41.0, 29.0)
+    db.commit()
+    ids = db.execute(select(Business.id).order_by(Business.id)).scalars().all()
+
+    ranges = [(ids[1], ids[3]), (ids[7], ids[7])]
+    selected = db.execute(select(Business.id).where(id_ranges_filter(ranges))).scalars().all()
+    assert sorted(selected) == [ids[1], ids[2], ids[3], ids[7]]
+
+    excluded = db.execute(select(Business.id).where(~id_set_filter([ids[0], ids[1], ids[9]]))).scalars().all()
+    assert sorted(excluded) == ids[2:9]
+
+    # Aralıklar açılmadan tek parametre olarak gönderilir
+    params = select(Business.id).where(id_ranges_filter([(1, 1_000_000)])).compile().params
+    assert "[[1, 1000000]]" in params.values()
+    db.close()
@@ -0,0 +1,53 @@
+"""
+Toplu kayıt testleri
+"""
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.schema import init_db
+from app.core.storage import configure_engine
+from app.models.business import Business
+from app.services import business_store
+from app.services.business_store import bulk_ingest
+
+
+def _session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    configure_engine(engine)
+    init_db(engine)
+    return sessionmaker(bind=engine)()
+
+
+def _result(place_id, name):
+    return {
+        "place_id": place_id, "name": name, "business_type": "kafe",
+        "city": "İstanbul", "latitude": 41.0, "longitude": 29.0
+    }
+
+
+def test_existing_rows_are_counted_as_duplicates(tmp_path):
+    db = _session(tmp_path)
+    assert bulk_ingest(db, [_result("osm_node_1", "A")])[:2] == (1, 0)
+
+    new_count, duplicate_count, rows = bulk_ingest(db, [_result("osm_node_1", "A2"), _result("osm_node_2", "B")])
+    assert (new_count, duplicate_count) == (1, 1)
+    # Var olan satır değişmeden döner, yeni satır id'siyle
+    assert [(row["place_id"], row["name"]) for row in rows] == [("osm_node_1", "A"), ("osm_node_2", "B")]
+    assert all(row["id"] for row in rows)
+    db.close()
+
+
+def test_conflicting_insert_is_skipped(tmp_path, monkeypatch):
+    db = _session(tmp_path)
+    bulk_ingest(db, [_result("osm_node_1", "A")])
+
+    # Eşzamanlı bir yazım: ön kontrol satırı görmez, çakışma INSERT ... ON CONFLICT'e kalır
+    monkeypatch.setattr(business_store, "_find_existing", lambda db, place_ids: {})
+    new_count, duplicate_count, rows = bulk_ingest(db, [_result("osm_node_1", "A2"), _result("osm_node_3", "C")])
+
+    assert (new_count, duplicate_count) == (1, 1)
+    assert [row["place_id"] for row in rows] == ["osm_node_3"]
+    assert db.execute(select(func.count(Business.id))).scalar() == 2
+    assert db.execute(select(Business.name).where(Business.place_id == "osm_node_1")).scalar() == "A"
+    db.close()
@@ -0,0 +1,55 @@
+"""
+Filtre sonuç önbelleği testleri
+"""
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.schema import init_db
+from app.core.storage import configure_engine
+from app.models.business import Business
+from app.services.business_filters import compile_filters
+from app.services.filter_results import FilterResultService
+
+
+def _session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    configure_engine(engine)
+    init_db(engine)
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    return sessionmaker(bind=engine)(), statements
+
+
+def _add(db, place_id, city):
+    db.add(Business(place_id=place_id, name=place_id, city=city, business_type="kafe"))
+    db.commit()
+
+
+def _counts(statements):
+    return sum("count(businesses.id)" in statement for statement in statements)
+
+
+def test_count_is_cached_per_data_version(tmp_path):
+    db, statements = _session(tmp_path)
+    service = FilterResultService(max_entries=8, max_ids=1000, max_counts=8)
+    compiled = compile_filters(city="İstanbul")
+    _add(db, "a", "İstanbul")
+
+    assert service.count(db, compiled) == 1
+    assert service.count(db, compiled) == 1
+    assert _counts(statements) == 1
+
+    # Yazım veri sürümünü artırır: sayı yeniden hesaplanır
+    _add(db, "b", "istanbul")
+    assert service.count(db, compiled) == 2
+    assert _counts(statements) == 2
+
+    # ID dizisi önbellekteyse sayım yapılmaz
+    assert list(service.ids(db, compiled)) and service.count(db, compiled) == 2
+    assert _counts(statements) == 2
+    db.close()
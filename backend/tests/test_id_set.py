@@ -0,0 +1,36 @@
+"""
+Sıkıştırılmış ID kümesi testleri
+"""
+
+import random
+
+import pytest
+
+from app.core.id_set import count_ids, decode_id_set, encode_id_set, iter_ids, to_ranges
+
+
+def test_negative_ids_are_rejected_with_clear_message():
+    with pytest.raises(ValueError, match="negatif"):
+        encode_id_set([3, -1, 5])
+
+
+@pytest.mark.parametrize("ids", [
+    [1],
+    [0, 1, 2],
+    [5, 3, 4, 10, 11, 200, 201, 202, 5],  # sırasız ve tekrarlı
+    list(range(1, 100001)),  # tek büyük aralık
+    [2 ** 40, 2 ** 40 + 1, 2 ** 62],  # çok baytlı varint'ler
+    random.Random(7).sample(range(1, 10 ** 6), 5000),
+])
+def test_round_trip(ids):
+    ranges = decode_id_set(encode_id_set(ids))
+    assert ranges == to_ranges(ids)
+    assert list(iter_ids(ranges)) == sorted(set(ids))
+    assert count_ids(ranges) == len(set(ids))
+
+
+def test_ranges_are_merged_and_compact():
+    assert to_ranges([7, 1, 2, 3, 5, 6]) == [(1, 3), (5, 7)]
+    # Ardışık 100 bin ID birkaç bayta sığar
+    assert len(encode_id_set(range(1, 100001))) < 32
+    assert decode_id_set(encode_id_set([])) == []
@@ -0,0 +1,84 @@
+"""
+Tile bazlı arama testleri (upstream ve kapsama indeksi sahte)
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.services.coverage_index import coverage_index
+from app.services.osm_service import osm_service
+
+
+@pytest.fixture
+def overpass(monkeypatch):
+    """Sorulan (bbox, limit) çiftlerini kaydeden sahte Overpass; yanıtı `respond` belirler"""
+    calls = []
+    state = {"respond": None}
+
+    async def fake_run_overpass(filters, area_filter, max_results, stats, priority=0, max_age=None):
+        south, west, north, east = (float(x) for x in area_filter.strip("()").split(","))
+        calls.append(((south, west, north, east), max_results))
+        return state["respond"](south, west, north, east, max_results), datetime.utcnow()
+
+    async def no_tiles(*args, **kwargs):
+        return {}
+
+    async def no_record(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(osm_service, "_run_overpass", fake_run_overpass)
+    monkeypatch.setattr(coverage_index, "lookup_tiles", no_tiles)
+    monkeypatch.setattr(coverage_index, "record", no_record)
+    return calls, state
+
+
+def _node(element_id, lat, lon):
+    return {"type": "node", "id": element_id, "lat": lat, "lon": lon, "tags": {"name": f"Kafe {element_id}"}}
+
+
+def _search(**kwargs):
+    stats = {"local_hits": 0, "upstream_errors": 0, "truncated": False}
+    area = {"type": "circle", "lat": 41.0, "lon": 29.0, "radius": kwargs.pop("radius")}
+    results = asyncio.run(osm_service._search_by_tiles(
+        ["amenity=cafe"], area, "kafe", kwargs.pop("max_results"), stats
+    ))
+    return results, stats
+
+
+def test_tiles_stop_once_max_results_reached(overpass):
+    calls, state = overpass
+
+    def respond(south, west, north, east, limit):
+        # Tile merkezinde 30 benzersiz işletme
+        base = int(abs(south * 1000)) * 100000 + int(abs(west * 1000)) * 100
+        return [_node(base + i, (south + north) / 2, (west + east) / 2) for i in range(30)]
+
+    state["respond"] = respond
+    results, stats = _search(radius=50000, max_results=100)
+
+    # 50 km'lik alan ~100 tile; yalnızca 100 sonuca yetecek kadarı (+ eşzamanlı olanlar) sorulur
+    assert len(results) >= 100
+    assert len(calls) <= 6
+    assert all(limit == 100 for _, limit in calls)
+    # En yakın tile önce sorulur
+    south, west, north, east = calls[0][0]
+    assert south <= 41.0 <= north and west <= 29.0 <= east
+    assert stats["truncated"] is False
+
+
+def test_truncated_tile_is_split_then_reported(overpass):
+    calls, state = overpass
+
+    def respond(south, west, north, east, limit):
+        # Hep limit kadar element, ama yalnızca 5 benzersiz işletme: her kademede kesilmiş görünür
+        return [_node(i % 5, 41.0, 29.0) for i in range(limit)]
+
+    state["respond"] = respond
+    results, stats = _search(radius=1000, max_results=50)
+
+    sizes = {round(north - south, 6) for (south, west, north, east), _ in calls}
+    assert sizes == {0.1, 0.05, 0.025}
+    assert len(results) == 5
+    assert stats["truncated"] is True
@@ -0,0 +1,154 @@
+"""
+Overpass zamanlayıcısı testleri
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.overpass_scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    OverpassScheduler,
+    UpstreamOverloaded
+)
+
+
+def _scheduler(**overrides):
+    options = dict(rate=1000, burst=100, slots=2, backoff_base=0.1, backoff_max=1, overload_retries=2)
+    options.update(overrides)
+    return OverpassScheduler(**options)
+
+
+def test_identical_queries_are_coalesced():
+    async def main():
+        scheduler = _scheduler()
+        release = asyncio.Event()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await release.wait()
+            return ["sonuç"]
+
+        first = asyncio.create_task(scheduler.run("q", fetch))
+        second = asyncio.create_task(scheduler.run("q", fetch))
+        other = asyncio.create_task(scheduler.run("başka", fetch))
+        await asyncio.sleep(0.01)
+        release.set()
+        return await asyncio.gather(first, second, other), calls
+
+    results, calls = asyncio.run(main())
+    assert results == [["sonuç"]] * 3
+    # "q" için tek upstream çağrısı, "başka" için ayrı bir çağrı
+    assert len(calls) == 2
+
+
+def test_interactive_queries_are_admitted_before_background():
+    async def main():
+        scheduler = _scheduler(slots=1)
+        release = asyncio.Event()
+        started = []
+
+        def fetcher(name):
+            async def fetch():
+                started.append(name)
+                if name == "blocker":
+                    await release.wait()
+                return name
+            return fetch
+
+        blocker = asyncio.create_task(scheduler.run("blocker", fetcher("blocker")))
+        await asyncio.sleep(0.01)
+        # Slot doluyken sıraya girenler: önce arka plan, sonra etkileşimli
+        background = asyncio.create_task(
+            scheduler.run("arka", fetcher("arka"), priority=PRIORITY_BACKGROUND)
+        )
+        await asyncio.sleep(0.01)
+        interactive = asyncio.create_task(
+            scheduler.run("etkileşimli", fetcher("etkileşimli"), priority=PRIORITY_INTERACTIVE)
+        )
+        await asyncio.sleep(0.01)
+        release.set()
+        await asyncio.gather(blocker, background, interactive)
+        return started
+
+    assert asyncio.run(main()) == ["blocker", "etkileşimli", "arka"]
+
+
+def test_joining_interactive_waiter_raises_queued_priority():
+    async def main():
+        scheduler = _scheduler(slots=1)
+        release = asyncio.Event()
+        started = []
+
+        def fetcher(name):
+            async def fetch():
+                started.append(name)
+                if name == "blocker":
+                    await release.wait()
+                return name
+            return fetch
+
+        blocker = asyncio.create_task(scheduler.run("blocker", fetcher("blocker")))
+        await asyncio.sleep(0.01)
+        first = asyncio.create_task(scheduler.run("a", fetcher("a"), priority=PRIORITY_BACKGROUND))
+        shared = asyncio.create_task(scheduler.run("b", fetcher("b"), priority=PRIORITY_BACKGROUND))
+        await asyncio.sleep(0.01)
+        # Aynı sorguya etkileşimli bir bekleyen bağlanır: "b" öne geçer
+        joined = asyncio.create_task(scheduler.run("b", fetcher("b"), priority=PRIORITY_INTERACTIVE))
+        await asyncio.sleep(0.01)
+        release.set()
+        await asyncio.gather(blocker, first, shared, joined)
+        return started
+
+    assert asyncio.run(main()) == ["blocker", "b", "a"]
+
+
+def test_overload_retries_after_retry_after():
+    async def main():
+        scheduler = _scheduler()
+        attempts = []
+
+        async def overloaded_once():
+            attempts.append(time.monotonic())
+            if len(attempts) == 1:
+                raise UpstreamOverloaded(429, retry_after=0.2)
+            return "tamam"
+
+        return await scheduler.run("q", overloaded_once), attempts
+
+    result, attempts = asyncio.run(main())
+    assert result == "tamam"
+    assert len(attempts) == 2
+    assert attempts[1] - attempts[0] >= 0.19
+
+
+def test_pause_blocks_other_queries_and_gives_up_after_retries():
+    async def main():
+        scheduler = _scheduler(overload_retries=1, backoff_base=0.1)
+        calls = []
+
+        async def always_overloaded():
+            calls.append(time.monotonic())
+            raise UpstreamOverloaded(504)
+
+        async def healthy():
+            return time.monotonic()
+
+        started = time.monotonic()
+        failing = asyncio.create_task(scheduler.run("kötü", always_overloaded))
+        await asyncio.sleep(0.01)
+        # İlk 504'ten sonra gelen sorgu geri çekilme bitene kadar bekler
+        healthy_at = await scheduler.run("iyi", healthy)
+        with pytest.raises(UpstreamOverloaded):
+            await failing
+        return started, calls, healthy_at
+
+    started, calls, healthy_at = asyncio.run(main())
+    # retry_after yok: backoff_base kadar (0.1 sn) geri çekilme, tek yeniden denemeden sonra hata
+    assert len(calls) == 2
+    assert healthy_at - started >= 0.09
+    assert calls[1] - calls[0] >= 0.09
+
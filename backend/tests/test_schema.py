@@ -0,0 +1,144 @@
+"""
+Şema (tetikleyiciler, indeksler) testleri
+"""
+
+import sqlite3
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.schema import init_db
+from app.core.storage import configure_engine
+from app.models.business import Business
+from app.services.business_filters import compile_filters
+
+
+def _engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    configure_engine(engine)
+    init_db(engine)
+    return engine
+
+
+def test_database_is_writable_without_app_functions(tmp_path):
+    engine = _engine(tmp_path)
+    engine.dispose()
+
+    # Uygulamanın SQL fonksiyonlarını kaydetmeyen düz bağlantı (sqlite3 CLI, yedekleme araçları)
+    conn = sqlite3.connect(tmp_path / "test.db")
+    conn.execute(
+        "INSERT INTO businesses (place_id, name, address, business_type) "
+        "VALUES ('osm_node_1', 'Kılıç Kafe', 'Şişli', 'kafe')"
+    )
+    conn.execute("UPDATE businesses SET name = 'KILIÇ Çiğköfte' WHERE place_id = 'osm_node_1'")
+    conn.commit()
+    conn.close()
+
+    db = sessionmaker(bind=engine)()
+    for search in ("kılıç", "KILIC", "cigkof", "sisli"):
+        compiled = compile_filters(search=search)
+        assert db.execute(compiled.apply(select(Business.place_id))).scalars().all() == ["osm_node_1"]
+    assert db.execute(compile_filters(search="kafe").apply(select(Business.id))).scalars().all() == []
+    db.close()
+
+
+def test_norm_columns_follow_orm_updates(tmp_path):
+    db = sessionmaker(bind=_engine(tmp_path))()
+    business = Business(place_id="osm_node_1", name="Kafe", city="İstanbul", business_type="Kafe")
+    db.add(business)
+    db.commit()
+    assert (business.city_norm, business.business_type_norm) == ("istanbul", "kafe")
+
+    business.city = "IĞDIR"
+    business.business_type = "Çiğköfte"
+    db.commit()
+    db.expire_all()
+    assert (business.city_norm, business.business_type_norm) == ("igdir", "cigkofte")
+    assert db.execute(compile_filters(city="ığdır").apply(select(Business.id))).scalars().all() == [business.id]
+    db.close()
+
+
+def test_norm_columns_are_backfilled_without_app_functions(tmp_path):
+    engine = _engine(tmp_path)
+    engine.dispose()
+
+    # Kolonlardan önceki şema: normalize kolonlar ve indeksleri yok
+    conn = sqlite3.connect(tmp_path / "test.db")
+    for index in ("ix_businesses_city_type_created", "ix_businesses_type_created"):
+        conn.execute(f"DROP INDEX {index}")
+    conn.execute("ALTER TABLE businesses DROP COLUMN city_norm")
+    conn.execute("ALTER TABLE businesses DROP COLUMN business_type_norm")
+    conn.execute(
+        "INSERT INTO businesses (place_id, name, city, business_type) "
+        "VALUES ('osm_node_1', 'Kafe', 'Şanlıurfa', 'Kafe')"
+    )
+    conn.commit()
+    conn.close()
+
+    # Migration uygulamanın SQL fonksiyonları olmadan da çalışır
+    plain = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    init_db(plain)
+    db = sessionmaker(bind=plain)()
+    row = db.execute(select(Business.city_norm, Business.business_type_norm)).one()
+    assert tuple(row) == ("sanliurfa", "kafe")
+    db.close()
+
+
+def _stats_match_group_by(conn):
+    stored = conn.execute(
+        "SELECT total, with_phone, with_website, rating_sum, rating_count FROM business_stats WHERE id = 1"
+    ).fetchone()
+    expected = conn.execute(
+        "SELECT count(*), coalesce(sum(coalesce(phone, '') != ''), 0), "
+        "coalesce(sum(coalesce(website, '') != ''), 0), coalesce(sum(rating), 0), count(rating) "
+        "FROM businesses"
+    ).fetchone()
+    assert stored == expected
+
+    cities = dict(conn.execute("SELECT city, count FROM business_city_stats").fetchall())
+    assert cities == dict(conn.execute(
+        "SELECT city, count(*) FROM businesses WHERE coalesce(city, '') != '' GROUP BY city"
+    ).fetchall())
+
+    categories = dict(conn.execute("SELECT business_type, count FROM business_category_stats").fetchall())
+    assert categories == dict(conn.execute(
+        "SELECT business_type, count(*) FROM businesses WHERE business_type IS NOT NULL GROUP BY business_type"
+    ).fetchall())
+
+
+def test_stats_counters_match_group_by(tmp_path):
+    _engine(tmp_path).dispose()
+    conn = sqlite3.connect(tmp_path / "test.db")
+    conn.executemany(
+        "INSERT INTO businesses (place_id, name, city, business_type, phone, website, rating) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            ("p1", "A", "İstanbul", "kafe", "0212", None, 4.5),
+            ("p2", "B", "İstanbul", "restoran", "", "https://b", None),
+            ("p3", "C", "Ankara", "kafe", None, "", 3.0),
+            ("p4", "D", None, "kafe", "0312", "https://d", 5.0),
+            ("p5", "E", "", "eczane", None, None, None),
+        ]
+    )
+    conn.commit()
+    _stats_match_group_by(conn)
+
+    # Sayılan her kolonun değişimi, şehir/kategori taşıma ve boşaltma
+    conn.execute("UPDATE businesses SET city = 'Ankara', phone = '0312' WHERE place_id = 'p2'")
+    conn.execute("UPDATE businesses SET business_type = 'restoran', rating = NULL WHERE place_id = 'p1'")
+    conn.execute("UPDATE businesses SET website = NULL, rating = 2.0, city = 'İzmir' WHERE place_id = 'p4'")
+    conn.execute("UPDATE businesses SET notes = 'sayılmayan kolon' WHERE place_id = 'p3'")
+    conn.commit()
+    _stats_match_group_by(conn)
+
+    conn.execute("DELETE FROM businesses WHERE place_id IN ('p3', 'p5')")
+    conn.commit()
+    _stats_match_group_by(conn)
+    # Sayısı sıfıra inen şehir/kategori satırı kalmaz
+    assert conn.execute("SELECT count(*) FROM business_category_stats WHERE business_type = 'eczane'").fetchone()[0] == 0
+
+    conn.execute("DELETE FROM businesses")
+    conn.commit()
+    _stats_match_group_by(conn)
+    assert conn.execute("SELECT count(*) FROM business_city_stats").fetchone()[0] == 0
+    conn.close()
@@ -462,6 +462,9 @@ function Search() {
                       <p>Toplam: {result.total_found} işletme bulundu</p>
                       <p>Yeni eklenen: {result.new_count}</p>
                       <p>Mükerrer: {result.duplicate_count}</p>
+                      {result.truncated && (
+                        <p className="text-amber-700">Bazı bölgeler sonuç limitine takıldı, sonuçlar eksik olabilir</p>
+                      )}
                     </div>
                   )}
                 </div>